@@ -217,35 +217,34 @@ class ActionExecutor:
         conn.commit()
         conn.close()
 
-    def get_audit_log(self, limit: int = 50) -> List[Dict]:
-        """Retrieve action audit log."""
+    def get_audit_log(self, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Retrieve action audit log, newest first, skipping the first `offset` entries."""
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
+        # Column aliases are the API's key names, so dict(row) builds each entry
         cursor.execute("""
-            SELECT id, timestamp, action_type, service_name, command, 
-                   user_approved, exit_code, error_message
+            SELECT id, timestamp, action_type, service_name AS service, command, 
+                   user_approved AS approved, exit_code, error_message AS error
             FROM action_audit_log
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ? OFFSET ?
+        """, (limit, offset))
         
-        logs = []
-        for row in cursor.fetchall():
-            logs.append({
-                "id": row[0],
-                "timestamp": row[1],
-                "action_type": row[2],
-                "service": row[3],
-                "command": row[4],
-                "approved": row[5],
-                "exit_code": row[6],
-                "error": row[7]
-            })
+        logs = [dict(row) for row in cursor.fetchmany(limit)]
         
         conn.close()
         return logs
 
+    def count_audit_log(self) -> int:
+        """Return the total number of audit log entries."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM action_audit_log").fetchone()[0]
+        finally:
+            conn.close()
+
     @staticmethod
     def _get_action_description(action_type: ActionType) -> str:
         """Get human-readable description of action."""
@@ -18,7 +18,7 @@ from datetime import datetime, timedelta, timezone
 from .graph import build_graph
 from .mother import Mother
 from .actions import ActionExecutor, ActionType
-from ..tools.log_reader import LogReader
+from ..tools.log_reader import LogReader, log_reader, get_service_logs
 from ..chat_auth import verify_chat_credentials
 
 # Load Monit API credentials from environment
@@ -350,6 +350,22 @@ def get_logs(service: str, _: str = Depends(verify_auth)):
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@app.delete("/logs/cache")
+def clear_logs_cache(_: str = Depends(verify_auth)):
+    """Drop cached log lookups so the next read hits the sources. Requires authentication."""
+    try:
+        log_reader.clear_cache()
+        mother.log_reader.clear_cache()
+        
+        return {
+            "status": "cleared",
+            "message": "Log cache has been cleared"
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
 # ============================================================================
 # MOTHER: Interactive Chat Interface (Phase 6)
 # ============================================================================
@@ -385,10 +401,12 @@ def mother_history(limit: int = 10, username: str = Depends(verify_auth), filter
         filter_user: If True, only return conversations from the authenticated user
     """
     try:
+        # Every chat turn is stored through this process's Mother (uvicorn runs
+        # a single worker), so its history cache can't go stale
         if filter_user:
-            history = mother.get_history(limit=limit, username=username)
+            history = mother.get_history(limit=limit, username=username, cache=True)
         else:
-            history = mother.get_history(limit=limit)
+            history = mother.get_history(limit=limit, cache=True)
         
         return {
             "count": len(history),
@@ -505,14 +523,36 @@ def execute_action(request: ActionRequest, _: str = Depends(verify_auth)):
 
 
 @app.get("/mother/actions/audit")
-def get_audit_log(limit: int = 50, _: str = Depends(verify_auth)):
-    """Get action audit log (all executed commands). Requires authentication."""
+def get_audit_log(
+    limit: int = 50,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    _: str = Depends(verify_auth),
+):
+    """Get action audit log (all executed commands), one page at a time. Requires authentication.
+
+    - ``page``: 1-based page number, newest entries first (default 1).
+    - ``page_size``: entries per page; defaults to ``limit`` for older clients.
+    """
+    if page < 1:
+        raise HTTPException(status_code=400, detail="page must be >= 1")
+    # An explicit page_size=0 is rejected below, not replaced by limit
+    if page_size is None:
+        page_size = limit
+    if page_size < 1:
+        raise HTTPException(status_code=400, detail="page_size (or limit) must be >= 1")
+    
     try:
-        logs = action_executor.get_audit_log(limit=limit)
+        total = action_executor.count_audit_log()
+        logs = action_executor.get_audit_log(limit=page_size, offset=(page - 1) * page_size)
         
         return {
             "count": len(logs),
-            "audit_log": logs
+            "audit_log": logs,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": (total + page_size - 1) // page_size
         }
     
     except Exception as e:
@@ -806,7 +846,7 @@ async def websocket_chat(websocket: WebSocket):
                 
                 elif msg_type == "history":
                     # Get conversation history
-                    history = mother.get_history(limit=10)
+                    history = mother.get_history(limit=10, cache=True)
                     await websocket.send_json({
                         "type": "history",
                         "conversations": history
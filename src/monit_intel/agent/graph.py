@@ -3,15 +3,19 @@ LangGraph workflow definition for Monit-Intel Agent.
 Builds the DAG for the ReAct loop.
 """
 
+import functools
 import sqlite3
 from typing import Any
 from langgraph.graph import StateGraph, START, END
 from langchain_ollama import ChatOllama
 from .state import AgentState
-from ..tools.log_reader import LogReader
+from ..tools.log_reader import get_service_logs_batch
 
-# Initialize Llama 3.1 model
-model = ChatOllama(model="llama3.1:8b", temperature=0.2)
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> ChatOllama:
+    """Create the Llama 3.1 model on first use, not at import time."""
+    return ChatOllama(model="llama3.1:8b", temperature=0.2)
 
 
 def detect_failures(state: AgentState) -> dict[str, Any]:
@@ -140,7 +144,7 @@ Be concise and actionable. Focus on the "Why" not just the "What"."""
 
 Which services need investigation and where should we look first?"""
 
-    response = model.invoke([
+    response = _get_model().invoke([
         ("system", system_prompt),
         ("user", user_message)
     ])
@@ -168,12 +172,9 @@ def fetch_logs_and_context(state: AgentState) -> dict[str, Any]:
                 service_name = parts[0].replace("Service:", "").strip()
                 services.append(service_name)
     
-    # Fetch logs for each failed service
-    logs_output = []
-    log_reader = LogReader()
-    for service in services:
-        log_content = log_reader.read_service_logs(service)
-        logs_output.append(log_content)
+    # Fetch logs for all failed services concurrently
+    logs_by_service = get_service_logs_batch(services)
+    logs_output = [logs_by_service[service] for service in services]
     
     enhanced_context = context + "\n\n" + "\n\n".join(logs_output)
     return {"context_data": enhanced_context}
@@ -3,19 +3,132 @@ Mother: Interactive chat interface for the Monit-Intel agent.
 Manages conversation history and context injection for LLM analysis.
 """
 
+import atexit
+import functools
+import hashlib
+import os
+import re
 import sqlite3
 import json
 import platform
 import subprocess
 import socket
+import threading
 from datetime import datetime, timezone
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, Iterator, List, Set
 from langchain_ollama import ChatOllama
 from .graph import build_graph
 from ..tools.log_reader import LogReader
 
-# Initialize LLM for direct queries
-llm = ChatOllama(model="llama3.1:8b", temperature=0.2)
+@functools.lru_cache(maxsize=1)
+def _get_llm() -> ChatOllama:
+    """Create the LLM for direct queries on first use, not at import time."""
+    return ChatOllama(model="llama3.1:8b", temperature=0.2)
+
+# Phrase buckets for queries answered deterministically (no analysis LLM call).
+# query_agent checks them in BUCKET_PRIORITY order and dispatches on the first hit.
+BUCKET_DATETIME = "datetime"
+BUCKET_DATA_RANGE = "data_range"
+BUCKET_CAPABILITIES = "capabilities"
+BUCKET_CONFIG = "config"
+
+BUCKET_PHRASES: Dict[str, tuple] = {
+    BUCKET_DATETIME: (
+        "what time is it", "current time", "time now", "tell me the time",
+        "what's the time", "what is the time",
+        "what date is it", "what is the date", "current date",
+        "today's date", "today date", "date today", "date and time",
+        "current datetime", "current time and date", "what day is it",
+        "day of week", "day today",
+    ),
+    BUCKET_DATA_RANGE: (
+        "since when do you have data", "data since", "from when is your data",
+        "earliest data", "start date", "data range", "how far back",
+    ),
+    BUCKET_CAPABILITIES: (
+        "what services are you monitoring",
+        "which services do you monitor",
+        "what do you monitor",
+        "monitoring capabilities",
+        "available services",
+        "list of services",
+        "tell me about the services",
+        "what can you monitor",
+    ),
+    # Questions about YOUR OWN configuration/setup (not service logs)
+    BUCKET_CONFIG: (
+        "your monitoring setup",
+        "your configuration",
+        "your database",
+        "tell me about your setup",
+        "tell me about your configuration",
+        "your ingest",
+        "your system info",
+        "your complete monitoring",
+        "describe your setup",
+        "how do you work",
+        "how are you configured",
+    ),
+}
+
+BUCKET_PRIORITY = (BUCKET_DATETIME, BUCKET_DATA_RANGE, BUCKET_CAPABILITIES, BUCKET_CONFIG)
+
+# All bucket phrases are ASCII, so matching runs on the ASCII-lowercased query
+# bytes: bytes.lower() skips Unicode case mapping and each `in` is a plain
+# byte search
+_BUCKET_PHRASES_B: Dict[str, tuple] = {
+    bucket: tuple(p.encode("ascii") for p in phrases)
+    for bucket, phrases in BUCKET_PHRASES.items()
+}
+
+# Fallback for date/time questions: whole words 'date'/'time' with a question context
+_DATETIME_RE = re.compile(rb"\b(what|current|today|now)\b.*\b(date|time|day)\b|\b(date|time)\b\s*\?")
+
+
+def _match_bucket(query: str) -> Optional[str]:
+    """Return the highest-priority phrase bucket matching the query."""
+    query_b = query.encode("ascii", "ignore").lower()
+    for bucket in BUCKET_PRIORITY:
+        if any(p in query_b for p in _BUCKET_PHRASES_B[bucket]):
+            return bucket
+        if bucket == BUCKET_DATETIME and _DATETIME_RE.search(query_b):
+            return bucket
+    return None
+
+# Stored in PRAGMA user_version once _init_conversations_table has built the
+# conversation schema; bump it whenever that schema changes
+CONVERSATIONS_SCHEMA_VERSION = 2
+
+
+def _query_hash(user_query: str) -> bytes:
+    """16-byte BLAKE2b digest of a query: a short, fixed-size lookup key for the text."""
+    return hashlib.blake2b(user_query.encode("utf-8"), digest_size=16).digest()
+
+
+# Small talk that gets the minimal prompt, and phrases that pull in the full
+# config context. Each list is one precompiled alternation; word boundaries
+# keep short greetings like "hi" from matching inside "history"
+SIMPLE_GREETINGS = (
+    "hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening",
+    "how are you", "what's up", "howdy", "sup", "yo", "hola", "salut",
+)
+FULL_CONTEXT_PHRASES = (
+    "system status", "overall", "what's", "how is", "how are", "tell me about",
+    "any issues", "any problems", "what's wrong", "failures", "errors",
+    "summary", "overview", "report", "update", "status",
+)
+_GREETING_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, SIMPLE_GREETINGS)) + r")\b", re.IGNORECASE)
+_FULL_CONTEXT_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, FULL_CONTEXT_PHRASES)) + r")\b", re.IGNORECASE)
+
+# Conversation writes are buffered and flushed in one transaction once the
+# buffer holds CONV_FLUSH_ROWS turns, or by a timer CONV_FLUSH_SECONDS after the
+# first buffered turn, so chat bursts don't pay one commit (fsync) per turn
+CONV_FLUSH_ROWS = 8
+CONV_FLUSH_SECONDS = 2.0
+
+# Per-service log fetches run in parallel in the LogReader's pool; logs that
+# haven't arrived this many seconds into a chat turn are skipped
+LOG_FETCH_TIMEOUT = 3.0
 
 
 class Mother:
@@ -24,8 +137,25 @@ class Mother:
     def __init__(self, db_path: str = "monit_history.db"):
         self.db_path = db_path
         self.log_reader = LogReader()
+        self._conv_buffer: List[tuple] = []
+        self._conv_timer: Optional[threading.Timer] = None
+        self._conv_lock = threading.Lock()
+        # Bumped on every conversation write; part of the history cache key so
+        # a write makes all older cached results unreachable
+        self._history_gen = 0
+        self._history_cached = functools.lru_cache(maxsize=128)(self._fetch_history)
+        self._dispatch = {
+            BUCKET_DATETIME: self._handle_datetime,
+            BUCKET_DATA_RANGE: self._handle_data_range,
+            BUCKET_CAPABILITIES: self._handle_capabilities,
+            BUCKET_CONFIG: self._handle_config,
+        }
         self._init_conversations_table()
+        atexit.register(self.flush_conversations)
         self.system_info = self._gather_system_info()
+        # Invariant system prompt text, rebuilt only when system_info changes
+        self._stable_system_prefix: Optional[str] = None
+        self._stable_system_prefix_key: Optional[tuple] = None
 
     def _gather_system_info(self) -> Dict:
         """Gather system information for context."""
@@ -115,6 +245,22 @@ class Mother:
         """Create conversations table if it doesn't exist."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        
+        # WAL turns each commit into a WAL append instead of rewriting a
+        # rollback journal, and readers no longer block the writer. The mode is
+        # stored in the database file, so this also converts existing DBs.
+        # synchronous=NORMAL skips the fsync per commit: a power loss can drop
+        # the last few commits, but never corrupts the DB. That's acceptable
+        # for chat history. It is per-connection, so flush_conversations sets it too.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        
+        # Already migrated: skip the table probes and DDL entirely
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= CONVERSATIONS_SCHEMA_VERSION:
+            conn.close()
+            return
+        
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -123,7 +269,8 @@ class Mother:
                 user_query TEXT NOT NULL,
                 agent_response TEXT NOT NULL,
                 service_context TEXT,
-                logs_provided TEXT
+                logs_provided TEXT,
+                query_hash BLOB
             )
         """)
         conn.commit()
@@ -135,15 +282,78 @@ class Mother:
             if "username" not in columns:
                 cursor.execute("ALTER TABLE conversations ADD COLUMN username TEXT")
                 conn.commit()
+            if "query_hash" not in columns:
+                cursor.execute("ALTER TABLE conversations ADD COLUMN query_hash BLOB")
+                conn.commit()
         except Exception as e:
             # If migration fails, log but don't crash - table might already be correct
-            print(f"Warning: Could not add username column: {e}")
+            print(f"Warning: Could not add conversations columns: {e}")
+        
+        # Exact-query lookups (find_by_query) go through a fixed-size digest
+        # instead of comparing arbitrarily long query text
+        conn.create_function("query_hash", 1, _query_hash, deterministic=True)
+        cursor.execute("""
+            UPDATE conversations SET query_hash = query_hash(user_query)
+            WHERE query_hash IS NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_qhash
+            ON conversations(query_hash)
+        """)
+        
+        # Serves per-user history (WHERE username = ? ORDER BY timestamp DESC)
+        # straight from the index, without a sort step
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_user_ts
+            ON conversations(username, timestamp DESC)
+        """)
+        # ...and the unfiltered history (ORDER BY timestamp DESC LIMIT ?)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_ts
+            ON conversations(timestamp DESC)
+        """)
+        
+        # One row per (conversation, mentioned service), kept in sync by a
+        # trigger over the service_context JSON so service-scoped lookups use
+        # an index instead of scanning and parsing every JSON blob
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversation_services'"
+        )
+        backfill = cursor.fetchone() is None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_services (
+                conversation_id INTEGER NOT NULL,
+                service_name TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, service_name)
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_convsvc_svc
+            ON conversation_services(service_name)
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_conversation_services
+            AFTER INSERT ON conversations
+            WHEN json_valid(NEW.service_context)
+            BEGIN
+                INSERT OR IGNORE INTO conversation_services (conversation_id, service_name)
+                SELECT NEW.id, value FROM json_each(NEW.service_context);
+            END
+        """)
+        if backfill:
+            cursor.execute("""
+                INSERT OR IGNORE INTO conversation_services (conversation_id, service_name)
+                SELECT c.id, j.value
+                FROM conversations c, json_each(c.service_context) j
+                WHERE json_valid(c.service_context)
+            """)
+        cursor.execute(f"PRAGMA user_version = {CONVERSATIONS_SCHEMA_VERSION}")
+        conn.commit()
         
         conn.close()
 
     def get_config_context(self) -> str:
         """Get configuration context about the system, ingest, and Monit setup."""
-        import os
         context_parts = []
         
         # Current date/time
@@ -274,23 +484,26 @@ class Mother:
     def get_service_logs(self, service_name: str) -> str:
         """Fetch recent logs for a service if available in the log registry."""
         try:
-            result = self.log_reader.get_logs_for_service(service_name)
-            if result.get("error"):
-                return ""  # Service not in registry, silently skip
-            
-            # Check if this is a Docker service (requires sudo)
-            if result.get("strategy") == "docker":
-                return f"\n[Note: {service_name} is a Docker container - logs require elevated privileges and are not accessible for security reasons]"
-            
-            logs = result.get("logs")
-            # Skip if logs are empty or just journalctl's "No entries" message
-            if logs and logs.strip() and "-- No entries --" not in logs:
-                return f"\n--- Recent logs for {service_name} ---\n{logs}"
-            else:
-                return ""  # No logs found, silently skip
+            return self._format_service_logs(service_name, self.log_reader.get_logs_for_service(service_name))
         except Exception as e:
             return ""  # Error fetching, silently skip
 
+    @staticmethod
+    def _format_service_logs(service_name: str, result: Dict) -> str:
+        """Format a LogReader result for the chat context ("" when there is nothing to show)."""
+        if result.get("error"):
+            return ""  # Service not in registry, silently skip
+        
+        # Check if this is a Docker service (requires sudo)
+        if result.get("strategy") == "docker":
+            return f"\n[Note: {service_name} is a Docker container - logs require elevated privileges and are not accessible for security reasons]"
+        
+        logs = result.get("logs")
+        # Skip if logs are empty or just journalctl's "No entries" message
+        if logs and logs.strip() and "-- No entries --" not in logs:
+            return f"\n--- Recent logs for {service_name} ---\n{logs}"
+        return ""  # No logs found, silently skip
+
     def get_monitored_services_info(self) -> str:
         """Return information about all monitored services and their log strategies."""
         service_context = self.get_service_context()
@@ -317,22 +530,9 @@ class Mother:
         
         # Add log source information
         lines.append("\n## Log Sources:")
-        log_reader = self.log_reader
-        log_registry = {
-            "system_backup": {"strategy": "newest_file", "source": "/data/tank/backups/sys_restore/backup_log_*.log"},
-            "nordvpn_reconnect": {"strategy": "tail_file", "source": "/var/log/nordvpn-reconnect.log"},
-            "nordvpn_status": {"strategy": "journalctl", "source": "nordvpnd.service"},
-            "gamma_conn": {"strategy": "journalctl", "source": "tailscaled.service"},
-            "network_resurrect": {"strategy": "tail_file", "source": "/var/log/monit-network-restart.log"},
-            "sanoid_errors": {"strategy": "journalctl", "source": "sanoid.service"},
-            "zfs-zed": {"strategy": "journalctl", "source": "zfs-zed.service"},
-            "smbd": {"strategy": "journalctl", "source": "smbd.service"},
-            "syncthing": {"strategy": "journalctl", "source": "syncthing.service (user)"},
-        }
-        
         lines.append("\n### Configured Log Sources:")
-        for service, info in sorted(log_registry.items()):
-            lines.append(f"  • {service}: {info['strategy']} ({info['source']})")
+        for service, (strategy, source) in sorted(self.log_reader.log_sources().items()):
+            lines.append(f"  • {service}: {strategy} ({source})")
         
         docker_services = [s for s in service_context if "running" in s or "http" in s]
         if docker_services:
@@ -348,7 +548,6 @@ class Mother:
 
     def get_historical_trends(self, services: List[str] = None, days: int = 30) -> str:
         """Get historical trend data for specific services or all services over the past N days."""
-        import json
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -466,8 +665,6 @@ class Mother:
         - "last month"
         Falls back to ``default_days`` when nothing is detected.
         """
-        import re
-
         q = query.lower()
 
         # Explicit numeric duration, e.g. "last 6 hours", "past 10 days"
@@ -542,8 +739,6 @@ class Mother:
         Limits output to the most recent 50 snapshots per service to
         keep responses readable in the chat UI.
         """
-        import json
-
         if not services:
             return "No services specified for trend table."
 
@@ -562,6 +757,29 @@ class Mother:
             show_cpu = "cpu" in metrics
             show_mem = "memory" in metrics
 
+            # Build header row based on selected metrics
+            columns = ["TIMESTAMP"]
+            if show_status:
+                columns.append("STATUS")
+            if show_cpu:
+                columns.append("CPU%")
+            if show_mem:
+                columns.append("MEM_MB")
+
+            # Fixed-width, space-separated columns for clear visual alignment
+            col_widths = {
+                "TIMESTAMP": 16,  # e.g. 2026-01-05 14:50
+                "STATUS": 6,
+                "CPU%": 6,
+                "MEM_MB": 7,
+            }
+            widths = [col_widths[col] for col in columns]
+
+            # The column layout is the same for every service, so format it once
+            row_fmt = "  ".join(f"{{:<{w}}}" for w in widths)
+            header_row = row_fmt.format(*columns)
+            separator = "  ".join("-" * w for w in widths)
+
             for service in services:
                 cursor.execute(
                     """
@@ -581,44 +799,16 @@ class Mother:
                     lines.append("")
                     continue
 
-                # Reverse to show oldest first
-                rows = list(reversed(rows))
-
-                header = f"Service {service} — last {int(days)} days (showing up to {len(rows)} samples)"
-                lines.append(header)
-
-                # Build header row based on selected metrics
-                columns = ["TIMESTAMP"]
-                if show_status:
-                    columns.append("STATUS")
-                if show_cpu:
-                    columns.append("CPU%")
-                if show_mem:
-                    columns.append("MEM_MB")
-
-                # Fixed-width, space-separated columns for clear visual alignment
-                col_widths = {
-                    "TIMESTAMP": 16,  # e.g. 2026-01-05 14:50
-                    "STATUS": 6,
-                    "CPU%": 6,
-                    "MEM_MB": 7,
-                }
-
-                def fmt_cell(col_name: str, value: str) -> str:
-                    width = col_widths.get(col_name, len(value))
-                    return value.ljust(width)
-
-                header_row = "  ".join(fmt_cell(col, col) for col in columns)
-                separator = "  ".join("-" * col_widths.get(col, len(col)) for col in columns)
+                # Title, header and separator followed by one line per sample
+                lines.append(f"Service {service} — last {int(days)} days (showing up to {len(rows)} samples)")
                 lines.append(header_row)
                 lines.append(separator)
 
-                for ts, status_val, raw_json in rows:
+                # Rows come newest first; walk them in reverse to show oldest first
+                for ts, status_val, raw_json in rows[::-1]:
                     # Compact local timestamp without timezone to keep columns narrow
                     try:
-                        from datetime import datetime as _dt
-
-                        dt = _dt.fromisoformat(ts)
+                        dt = datetime.fromisoformat(ts)
                         if dt.tzinfo is None:
                             dt = dt.replace(tzinfo=timezone.utc)
                         ts_local = dt.astimezone().strftime("%Y-%m-%d %H:%M")
@@ -651,15 +841,15 @@ class Mother:
                         except Exception:
                             pass
 
-                    cells = [fmt_cell("TIMESTAMP", ts_local)]
+                    cells = [ts_local]
                     if show_status:
-                        cells.append(fmt_cell("STATUS", status_str))
+                        cells.append(status_str)
                     if show_cpu:
-                        cells.append(fmt_cell("CPU%", cpu_val))
+                        cells.append(cpu_val)
                     if show_mem:
-                        cells.append(fmt_cell("MEM_MB", mem_val))
+                        cells.append(mem_val)
 
-                    lines.append("  ".join(cells))
+                    lines.append(row_fmt.format(*cells))
 
                 lines.append("")  # blank line between services
 
@@ -685,100 +875,10 @@ class Mother:
             self._store_conversation(user_query, easter_egg, "", [], username)
             return easter_egg
 
-        # Handle direct date/time questions deterministically
-        ql = user_query.lower()
-        # Common variations
-        date_time_phrases = [
-            "what time is it", "current time", "time now", "tell me the time",
-            "what's the time", "what is the time",
-            "what date is it", "what is the date", "current date",
-            "today's date", "today date", "date today", "date and time",
-            "current datetime", "current time and date", "what day is it",
-            "day of week", "day today"
-        ]
-        is_time_date = any(p in ql for p in date_time_phrases)
-        if not is_time_date:
-            # Regex fallback on whole words 'date' or 'time' with a question context
-            import re
-            if re.search(r"\b(what|current|today|now)\b.*\b(date|time|day)\b|\b(date|time)\b\s*\?", ql):
-                is_time_date = True
-        if is_time_date:
-            now_str = self._now_string()
-            resp = f"Current date/time: {now_str}"
-            self._store_conversation(user_query, resp, "", [])
-            return resp
-
-        # Handle data range questions deterministically (global DB range)
-        if any(phrase in ql for phrase in [
-            "since when do you have data", "data since", "from when is your data",
-            "earliest data", "start date", "data range", "how far back"
-        ]):
-            try:
-                conn = sqlite3.connect(self.db_path)
-                cur = conn.cursor()
-                cur.execute("SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM snapshots")
-                row = cur.fetchone() or (None, None, 0)
-                conn.close()
-                min_ts, max_ts, count = row
-                if count and min_ts and max_ts:
-                    resp = f"I have {count} snapshots from {min_ts} to {max_ts}."
-                else:
-                    resp = "No snapshot data available yet."
-            except Exception as e:
-                resp = f"Unable to query data range: {e}"
-            self._store_conversation(user_query, resp, "", [])
-            return resp
-        
-        # Check if user is asking about monitoring capabilities
-        query_lower = user_query.lower()
-        if any(phrase in query_lower for phrase in [
-            "what services are you monitoring",
-            "which services do you monitor",
-            "what do you monitor",
-            "monitoring capabilities",
-            "available services",
-            "list of services",
-            "tell me about the services",
-            "what can you monitor"
-        ]):
-            response = self.get_monitored_services_info()
-            self._store_conversation(user_query, response, "", [], username)
-            return response
-        
-        # Check if user is asking about YOUR OWN configuration/setup (not service logs)
-        if any(phrase in query_lower for phrase in [
-            "your monitoring setup",
-            "your configuration",
-            "your database",
-            "tell me about your setup",
-            "tell me about your configuration",
-            "your ingest",
-            "your system info",
-            "your complete monitoring",
-            "describe your setup",
-            "how do you work",
-            "how are you configured"
-        ]):
-            # Answer about own configuration without pulling in service logs
-            config_context = self.get_config_context()
-            system_prompt = f"""You are MU/TH/UR, the primary AI of Monit-Intel monitoring system.
-Answer the user's question about YOUR OWN configuration and setup using these facts:
-
-{config_context}
-
-Answer directly and authoritatively. Do NOT analyze service logs or provide generic monitoring advice.
-Focus only on describing your configuration as stated above."""
-            
-            try:
-                messages = [("system", system_prompt), ("human", user_query)]
-                response_obj = llm.invoke(messages)
-                response = response_obj.content
-                self._store_conversation(user_query, response, "", [], username)
-                return response
-            except Exception as e:
-                error_response = f"Error processing configuration query: {str(e)}"
-                self._store_conversation(user_query, error_response, "", [], username)
-                return error_response
+        # Deterministic answers (date/time, data range, capabilities, own config)
+        bucket = _match_bucket(user_query)
+        if bucket is not None:
+            return self._dispatch[bucket](user_query, username)
         
         # Extract service mentions from query
         service_context = self.get_service_context()
@@ -809,20 +909,12 @@ Focus only on describing your configuration as stated above."""
         
         # Invoke LLM directly with context
         try:
-            # Decide if we should include full config context
-            query_lower = user_query.lower()
-            
             # Check if this is just a simple greeting/chat (no analysis needed)
-            simple_greetings = ["hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening", 
-                              "how are you", "what's up", "howdy", "sup", "yo", "hola", "salut"]
-            is_simple_greeting = any(greeting in query_lower for greeting in simple_greetings)
+            is_simple_greeting = bool(_GREETING_RE.search(user_query))
             
+            # Decide if we should include full config context
             include_full_context = (
-                (any(phrase in query_lower for phrase in [
-                    "system status", "overall", "what's", "how is", "how are", "tell me about",
-                    "any issues", "any problems", "what's wrong", "failures", "errors",
-                    "summary", "overview", "report", "update", "status"
-                ]) or len(mentioned_services) > 0)
+                (bool(_FULL_CONTEXT_RE.search(user_query)) or len(mentioned_services) > 0)
                 and not is_simple_greeting
             )
             
@@ -846,8 +938,91 @@ When users ask for help, ask clarifying questions like:
 - "Do you need help with a specific issue?"
 """
             else:
-                # For detailed queries, use the full context prompt
-                system_prompt = f"""You are MU/TH/UR, the primary artificial intelligence of the Monit-Intel monitoring system.
+                # For detailed queries, reuse the cached invariant prefix and
+                # only format the per-turn tail
+                if asking_about_specific:
+                    data_access = "You have access to current service status information AND detailed log data. ANALYZE THE LOGS and include log-based findings in your response."
+                else:
+                    data_access = f"You have access to current service status and historical trend data for the {data_age_text}."
+                system_prompt = f"{self._get_stable_system_prefix()}\n{config_section}\n\n{data_access}"
+            
+            response = _get_llm().invoke([
+                ("system", system_prompt),
+                ("user", f"{user_query}\n\n--- Current System Status ---\n{context_info}\n\n--- Historical Trends ({data_age_text}) ---\n{historical_info}")
+            ])
+            
+            response_text = response.content if hasattr(response, "content") else str(response)
+        
+        except Exception as e:
+            response_text = f"Error analyzing query: {str(e)}"
+        
+        # Store conversation
+        self._store_conversation(user_query, response_text, context_info + "\n\n" + historical_info, mentioned_services, username)
+        
+        return response_text
+
+    def _handle_datetime(self, user_query: str, username: Optional[str]) -> str:
+        """Answer direct date/time questions deterministically."""
+        resp = f"Current date/time: {self._now_string()}"
+        self._store_conversation(user_query, resp, "", [], username)
+        return resp
+
+    def _handle_data_range(self, user_query: str, username: Optional[str]) -> str:
+        """Answer data range questions deterministically (global DB range)."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cur = conn.cursor()
+            cur.execute("SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM snapshots")
+            row = cur.fetchone() or (None, None, 0)
+            conn.close()
+            min_ts, max_ts, count = row
+            if count and min_ts and max_ts:
+                resp = f"I have {count} snapshots from {min_ts} to {max_ts}."
+            else:
+                resp = "No snapshot data available yet."
+        except Exception as e:
+            resp = f"Unable to query data range: {e}"
+        self._store_conversation(user_query, resp, "", [], username)
+        return resp
+
+    def _handle_capabilities(self, user_query: str, username: Optional[str]) -> str:
+        """Answer questions about monitoring capabilities."""
+        response = self.get_monitored_services_info()
+        self._store_conversation(user_query, response, "", [], username)
+        return response
+
+    def _handle_config(self, user_query: str, username: Optional[str]) -> str:
+        """Answer questions about our own configuration without pulling in service logs."""
+        config_context = self.get_config_context()
+        system_prompt = f"""You are MU/TH/UR, the primary AI of Monit-Intel monitoring system.
+Answer the user's question about YOUR OWN configuration and setup using these facts:
+
+{config_context}
+
+Answer directly and authoritatively. Do NOT analyze service logs or provide generic monitoring advice.
+Focus only on describing your configuration as stated above."""
+        
+        try:
+            messages = [("system", system_prompt), ("human", user_query)]
+            response_obj = _get_llm().invoke(messages)
+            response = response_obj.content
+            self._store_conversation(user_query, response, "", [], username)
+            return response
+        except Exception as e:
+            error_response = f"Error processing configuration query: {str(e)}"
+            self._store_conversation(user_query, error_response, "", [], username)
+            return error_response
+
+    def _get_stable_system_prefix(self) -> str:
+        """Return the invariant part of the analysis system prompt.
+
+        Role, OS, package manager and guidelines only depend on ``system_info``,
+        so the prompt is formatted once and reused until that changes. Keeping
+        it as an identical leading string also lets providers cache the prefix.
+        """
+        key = tuple(sorted(self.system_info.items()))
+        if self._stable_system_prefix is None or self._stable_system_prefix_key != key:
+            self._stable_system_prefix = f"""You are MU/TH/UR, the primary artificial intelligence of the Monit-Intel monitoring system.
 
 You have knowledge of your own configuration, the services you monitor, and all operational parameters.
 
@@ -857,7 +1032,7 @@ ABOUT YOUR CONFIGURATION:
 - You use the Monit XML API at http://localhost:2812/
 - You collect data every 5 minutes via systemd timer
 
-You are assisting on a {self.system_info['os']} system ({self.system_info['distro']}) with {self.system_info['package_manager']} package manager.{config_section}
+You are assisting on a {self.system_info['os']} system ({self.system_info['distro']}) with {self.system_info['package_manager']} package manager.
 
 WHEN ANALYZING SERVICE LOGS:
 If service logs are provided in the "Recent logs" section, you MUST:
@@ -876,7 +1051,6 @@ IMPORTANT GUIDELINES:
 - When stating time ranges, use the actual data range shown in the historical trends section
 - Do NOT claim services have been running for 30 days if data only covers 1 day
 
-{"You have access to current service status information AND detailed log data. ANALYZE THE LOGS and include log-based findings in your response." if asking_about_specific else f"You have access to current service status and historical trend data for the {data_age_text}."}
 When users ask about changes, trends, history, CPU usage, or resource metrics:
 - Base all recommendations on the actual data range provided (which may be less than 30 days)
 - Provide specific numbers and percentages from the historical data
@@ -884,21 +1058,8 @@ When users ask about changes, trends, history, CPU usage, or resource metrics:
 - Reference the date range shown in the trends data
 
 Be concise, actionable, and tailor advice to the specific OS and package manager."""
-            
-            response = llm.invoke([
-                ("system", system_prompt),
-                ("user", f"{user_query}\n\n--- Current System Status ---\n{context_info}\n\n--- Historical Trends ({data_age_text}) ---\n{historical_info}")
-            ])
-            
-            response_text = response.content if hasattr(response, "content") else str(response)
-        
-        except Exception as e:
-            response_text = f"Error analyzing query: {str(e)}"
-        
-        # Store conversation
-        self._store_conversation(user_query, response_text, context_info + "\n\n" + historical_info, mentioned_services, username)
-        
-        return response_text
+            self._stable_system_prefix_key = key
+        return self._stable_system_prefix
 
     def _get_data_age_days(self, services: List[str]) -> int:
         """Calculate the number of days of data available for the given services."""
@@ -928,7 +1089,6 @@ Be concise, actionable, and tailor advice to the specific OS and package manager
         conn.close()
         
         if min_date and max_date:
-            from datetime import datetime
             min_dt = datetime.fromisoformat(min_date.split(' ')[0])
             max_dt = datetime.fromisoformat(max_date.split(' ')[0])
             days_diff = (max_dt - min_dt).days + 1  # +1 to include both start and end days
@@ -972,7 +1132,6 @@ SPECIAL ORDER 937 SCIENCE OFFICER EYES ONLY"""
 
     def _extract_services(self, query: str, service_context: Dict) -> List[str]:
         """Extract mentioned service names from user query."""
-        import re
         mentioned = []
         query_lower = query.lower()
         
@@ -1021,14 +1180,22 @@ SPECIAL ORDER 937 SCIENCE OFFICER EYES ONLY"""
         """Build formatted context information for LLM."""
         lines = ["Current Service Status:", ""]
         
+        # Fetch logs for all known services concurrently; wall time is the
+        # slowest fetch (capped at LOG_FETCH_TIMEOUT) rather than the sum of them
+        log_results = self.log_reader.get_logs_for_services(
+            [service for service in services if service in context],
+            timeout=LOG_FETCH_TIMEOUT,
+        )
+        
         for service in services:
             if service in context:
                 info = context[service]
                 status = "✓ HEALTHY" if info["healthy"] else "✗ FAILED"
                 lines.append(f"  {service}: {status} (last checked: {info['last_checked']})")
                 
-                # Try to fetch and include logs for this service
-                logs = self.get_service_logs(service)
+                # Include logs for this service if they arrived in time
+                result = log_results.get(service)
+                logs = self._format_service_logs(service, result) if result else ""
                 if logs:  # Only add if logs returned something
                     lines.append(logs)
         
@@ -1036,56 +1203,152 @@ SPECIAL ORDER 937 SCIENCE OFFICER EYES ONLY"""
 
     def _store_conversation(self, user_query: str, response: str, 
                           context: str, services: List[str], username: Optional[str] = None):
-        """Store conversation in SQLite."""
+        """Queue a conversation for storage, flushing the buffer when it is full or on a timer."""
+        # Record the turn time now; the row may only hit the table on a later flush
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        # Most turns mention no service; compact separators keep stored rows small
+        services_json = json.dumps(services, separators=(",", ":")) if services else "[]"
+        with self._conv_lock:
+            if not self._conv_buffer:
+                # First buffered turn: make sure it reaches the table even if
+                # no other turn arrives
+                self._conv_timer = threading.Timer(CONV_FLUSH_SECONDS, self.flush_conversations)
+                self._conv_timer.daemon = True
+                self._conv_timer.start()
+            self._history_gen += 1
+            self._conv_buffer.append(
+                (timestamp, username, user_query, response, services_json, context,
+                 _query_hash(user_query))
+            )
+            due = len(self._conv_buffer) >= CONV_FLUSH_ROWS
+        if due:
+            self.flush_conversations()
+
+    def flush_conversations(self):
+        """Write all buffered conversations with a single executemany + commit."""
+        with self._conv_lock:
+            if self._conv_timer is not None:
+                self._conv_timer.cancel()
+                self._conv_timer = None
+            if not self._conv_buffer:
+                return
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.executemany("""
+                    INSERT INTO conversations (timestamp, username, user_query, agent_response, service_context, logs_provided, query_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, self._conv_buffer)
+                conn.commit()
+                self._conv_buffer.clear()
+            finally:
+                conn.close()
+
+    def get_history(self, limit: int = 10, username: Optional[str] = None,
+                    cache: bool = False) -> List[Dict]:
+        """
+        Retrieve conversation history, optionally filtered by username.
+        
+        With cache=True, repeated calls are answered from an in-process LRU
+        until this instance stores or clears a conversation. Writes made by
+        other Mother instances or processes on the same database don't
+        invalidate it, so only use the cache when this instance is the sole writer.
+        """
+        if not cache:
+            return list(self.iter_history(limit=limit, username=username))
+        # Copies, so callers can't modify the cached entries
+        return [dict(conv) for conv in self._history_cached(self._history_gen, limit, username)]
+
+    def _fetch_history(self, generation: int, limit: int, username: Optional[str]) -> tuple:
+        """Uncached history read behind _history_cached (generation is only a cache key)."""
+        return tuple(self.iter_history(limit=limit, username=username))
+
+    def iter_history(self, limit: int = 10, username: Optional[str] = None) -> Iterator[Dict]:
+        """Yield conversation history newest first, fetching rows in small batches."""
+        self.flush_conversations()
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            
+            # Two statements rather than "(? IS NULL OR username = ?)": the OR form
+            # can't use idx_conversations_user_ts and falls back to scan + sort
+            if username:
+                cursor.execute("""
+                    SELECT id, timestamp, username, user_query, agent_response 
+                    FROM conversations 
+                    WHERE username = ?
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                """, (username, limit))
+            else:
+                cursor.execute("""
+                    SELECT id, timestamp, username, user_query, agent_response 
+                    FROM conversations 
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                """, (limit,))
+            
+            while True:
+                rows = cursor.fetchmany(64)
+                if not rows:
+                    break
+                yield from map(dict, rows)
+        finally:
+            conn.close()
+
+    def get_history_for_service(self, service_name: str, limit: int = 10) -> List[Dict]:
+        """Retrieve the most recent conversations that mentioned a service."""
+        self.flush_conversations()
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         cursor.execute("""
-            INSERT INTO conversations (username, user_query, agent_response, service_context, logs_provided)
-            VALUES (?, ?, ?, ?, ?)
-        """, (username, user_query, response, json.dumps(services), context))
+            SELECT c.id, c.timestamp, c.username, c.user_query, c.agent_response
+            FROM conversation_services cs
+            JOIN conversations c ON c.id = cs.conversation_id
+            WHERE cs.service_name = ?
+            ORDER BY c.timestamp DESC
+            LIMIT ?
+        """, (service_name, limit))
+        
+        history = [dict(row) for row in cursor.fetchall()]
         
-        conn.commit()
         conn.close()
+        return history
 
-    def get_history(self, limit: int = 10, username: Optional[str] = None) -> List[Dict]:
-        """Retrieve conversation history, optionally filtered by username."""
+    def find_by_query(self, user_query: str, limit: int = 10) -> List[Dict]:
+        """Retrieve the most recent conversations that asked exactly this query."""
+        self.flush_conversations()
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        if username:
-            cursor.execute("""
-                SELECT id, timestamp, username, user_query, agent_response 
-                FROM conversations 
-                WHERE username = ?
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (username, limit))
-        else:
-            cursor.execute("""
-                SELECT id, timestamp, username, user_query, agent_response 
-                FROM conversations 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-        
-        history = []
-        for row in cursor.fetchall():
-            history.append({
-                "id": row[0],
-                "timestamp": row[1],
-                "username": row[2],
-                "user_query": row[3],
-                "agent_response": row[4]
-            })
+        # The text comparison only runs on the rows the digest index matched
+        cursor.execute("""
+            SELECT id, timestamp, username, user_query, agent_response
+            FROM conversations
+            WHERE query_hash = ? AND user_query = ?
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """, (_query_hash(user_query), user_query, limit))
+        
+        history = [dict(row) for row in cursor.fetchall()]
         
         conn.close()
         return history
 
     def clear_history(self):
         """Clear conversation history."""
+        with self._conv_lock:
+            self._conv_buffer.clear()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         cursor.execute("DELETE FROM conversations")
+        cursor.execute("DELETE FROM conversation_services")
         conn.commit()
         conn.close()
+        with self._conv_lock:
+            self._history_gen += 1
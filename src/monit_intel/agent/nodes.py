@@ -1,11 +1,17 @@
+import functools
+import io
 import sqlite3
 import json
 from langchain_ollama import ChatOllama
 from .state import AgentState
-from ..tools.log_reader import LogReader
+from ..tools.log_reader import get_service_logs_batch
+
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> ChatOllama:
+    """Create our model (on GPU 1) on first use, not at import time."""
+    return ChatOllama(model="llama3.1:8b", temperature=0.2)
 
-# Initialize our model (on GPU 1)
-model = ChatOllama(model="llama3.1:8b", temperature=0.2)
 
 def fetch_db_node(state: AgentState):
     """
@@ -15,20 +21,26 @@ def fetch_db_node(state: AgentState):
     cursor = conn.cursor()
     
     # Get the latest snapshot for every service
+    cursor.arraysize = 256
     cursor.execute("""
         SELECT service_name, status, raw_json 
         FROM snapshots 
         WHERE timestamp = (SELECT MAX(timestamp) FROM snapshots)
     """)
-    rows = cursor.fetchall()
-    conn.close()
 
-    # Format the data into a readable block for the LLM
-    reports = []
-    for row in rows:
-        reports.append(f"Service: {row[0]} | Status: {row[1]} | Data: {row[2]}")
+    # Format the data into a readable block for the LLM, streaming rows
+    # straight into the buffer in arraysize batches instead of materializing them first
+    buf = io.StringIO()
+    try:
+        sep = ""
+        while rows := cursor.fetchmany():
+            for row in rows:
+                buf.write(f"{sep}Service: {row[0]} | Status: {row[1]} | Data: {row[2]}")
+                sep = "\n"
+    finally:
+        conn.close()
     
-    return {"current_monit_data": "\n".join(reports)}
+    return {"current_monit_data": buf.getvalue()}
 
 def fetch_logs_node(state: AgentState):
     """
@@ -48,11 +60,9 @@ def fetch_logs_node(state: AgentState):
                 service_name = parts[0].replace("Service:", "").strip()
                 services.append(service_name)
     
-    # Fetch logs for each failed service
-    logs_output = []
-    for service in services:
-        log_content = get_service_logs(service)
-        logs_output.append(log_content)
+    # Fetch logs for all failed services concurrently
+    logs_by_service = get_service_logs_batch(services)
+    logs_output = [logs_by_service[service] for service in services]
     
     enhanced_context = context + "\n\n" + "\n\n".join(logs_output)
     return {"context_data": enhanced_context}
@@ -71,6 +81,6 @@ Your job is to:
 Be concise and actionable. Focus on the "Why" not just the "What"."""
     
     messages = [("system", system_prompt)] + state["messages"]
-    response = model.invoke(messages)
+    response = _get_model().invoke(messages)
     
     return {"messages": [response]}
@@ -4,15 +4,119 @@ Hello Mother: Interactive chat with the Monit-Intel agent.
 Default mode is interactive chat. Use subcommands for other operations.
 """
 
+import asyncio
+import atexit
 import click
-import requests
 import json
-from typing import Optional
+import sys
+from io import StringIO
+from typing import TYPE_CHECKING, Optional
 from datetime import datetime
-from tabulate import tabulate
+
+# httpx and tabulate are imported on first use so `--help`, shell completion
+# and commands that never hit the API don't pay for loading them
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ImportError:  # optional; falls back to httpx's stdlib-json decoding
+    _HAVE_ORJSON = False
 
 API_URL = "http://localhost:8000"
 
+# Audit tables with at least this many rows use tabulate's "simple" format;
+# "grid" draws a border line per row and gets slow on big --limit values
+AUDIT_GRID_MAX_ROWS = 50
+
+# Raw ANSI codes for views that print many colored lines at once, so they
+# can be joined into one write instead of styling each line via click
+_ANSI_GREEN = "\x1b[32m"
+_ANSI_RED = "\x1b[31m"
+_ANSI_WHITE = "\x1b[37m"
+_ANSI_CYAN_BOLD = "\x1b[36m\x1b[1m"
+_ANSI_RESET = "\x1b[0m"
+
+# Per-call timeout for LLM turns and action execution. The shared client's 30 s
+# default is for quick reads: a cold Ollama turn can take longer, and the
+# server itself gives an action up to 30 s, so these calls wait for the answer
+_SLOW_CALL_TIMEOUT = None
+
+# One event loop and one pooled AsyncClient for the whole CLI process, so
+# interactive prompts reuse keep-alive connections instead of reconnecting
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def _run(coro):
+    """Run a coroutine on the CLI's persistent event loop."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        atexit.register(_shutdown)
+    return _loop.run_until_complete(coro)
+
+
+def _shutdown():
+    """Close the shared client and event loop at exit."""
+    global _client, _loop
+    if _client is not None:
+        _loop.run_until_complete(_client.aclose())
+        _client = None
+    _loop.close()
+    _loop = None
+
+
+def _get_client(api_url: str) -> "httpx.AsyncClient":
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        import httpx
+        _client = httpx.AsyncClient(
+            base_url=api_url,
+            timeout=30,
+            # Everything goes to one host; a small pool covers the concurrent
+            # status + history requests and keeps those sockets alive between prompts
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            headers={"Connection": "keep-alive"},
+        )
+    return _client
+
+
+async def _request(api_url: str, method: str, path: str, **kwargs) -> "httpx.Response":
+    """
+    Issue one request against the agent API with the shared client.
+    
+    Connection failures are re-raised as the builtin ConnectionError so
+    command bodies can catch them without importing httpx.
+    """
+    client = _get_client(api_url)
+    import httpx
+    try:
+        return await client.request(method, path, **kwargs)
+    except httpx.ConnectError as e:
+        raise ConnectionError(str(e)) from e
+
+
+async def _gather(api_url: str, *calls):
+    """Issue several (method, path, kwargs) requests concurrently."""
+    return await asyncio.gather(
+        *(_request(api_url, method, path, **kwargs) for method, path, kwargs in calls)
+    )
+
+
+def _call(api_url: str, method: str, path: str, **kwargs) -> "httpx.Response":
+    """Synchronous wrapper around _request for Click command bodies."""
+    return _run(_request(api_url, method, path, **kwargs))
+
+
+def _parse(response: "httpx.Response"):
+    """Decode a JSON response body, with orjson when it is installed."""
+    if _HAVE_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 @click.group(invoke_without_command=True)
 @click.pass_context
@@ -40,13 +144,13 @@ def hello_mother(ctx):
 def chat(ctx, query):
     """Chat with the agent using natural language."""
     try:
-        response = requests.post(
-            f"{ctx.obj['api_url']}/mother/chat",
-            json={"query": query}
+        response = _call(
+            ctx.obj['api_url'], "POST", "/mother/chat",
+            json={"query": query}, timeout=_SLOW_CALL_TIMEOUT
         )
         response.raise_for_status()
         
-        data = response.json()
+        data = _parse(response)
         
         click.echo()
         click.secho("🤖 Agent Response:", fg="cyan", bold=True)
@@ -55,7 +159,7 @@ def chat(ctx, query):
         click.echo()
         click.echo(f"Timestamp: {data['timestamp']}")
     
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
         click.echo("Make sure the agent is running: pixi run python main.py --api 5 8000")
     except Exception as e:
@@ -68,13 +172,13 @@ def chat(ctx, query):
 def history(ctx, limit):
     """View conversation history."""
     try:
-        response = requests.get(
-            f"{ctx.obj['api_url']}/mother/history",
+        response = _call(
+            ctx.obj['api_url'], "GET", "/mother/history",
             params={"limit": limit}
         )
         response.raise_for_status()
         
-        data = response.json()
+        data = _parse(response)
         
         if not data["conversations"]:
             click.echo("📭 No conversation history yet.")
@@ -90,7 +194,7 @@ def history(ctx, limit):
             click.secho(f"🤖 Agent: {conv['agent_response'][:80]}...", fg="green")
             click.echo()
     
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
     except Exception as e:
         click.secho(f"❌ Error: {str(e)}", fg="red")
@@ -102,12 +206,12 @@ def history(ctx, limit):
 def clear(ctx):
     """Clear conversation history."""
     try:
-        response = requests.delete(f"{ctx.obj['api_url']}/mother/clear")
+        response = _call(ctx.obj['api_url'], "DELETE", "/mother/clear")
         response.raise_for_status()
         
         click.secho("✓ Conversation history cleared.", fg="green")
     
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
     except Exception as e:
         click.secho(f"❌ Error: {str(e)}", fg="red")
@@ -130,13 +234,13 @@ def actions():
 def suggest(ctx, action, service):
     """Suggest an action without executing it."""
     try:
-        response = requests.post(
-            f"{ctx.obj['api_url']}/mother/actions/suggest",
+        response = _call(
+            ctx.obj['api_url'], "POST", "/mother/actions/suggest",
             json={"action": action.lower(), "service": service}
         )
         response.raise_for_status()
         
-        data = response.json()
+        data = _parse(response)
         
         if not data.get("allowed"):
             click.secho(f"❌ Not allowed: {data.get('reason')}", fg="red")
@@ -153,7 +257,7 @@ def suggest(ctx, action, service):
         click.echo()
         click.secho("To execute: mother actions execute {action} {service} --approve", fg="white")
     
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
     except Exception as e:
         click.secho(f"❌ Error: {str(e)}", fg="red")
@@ -177,13 +281,14 @@ def execute(ctx, action, service, approve):
         return
     
     try:
-        response = requests.post(
-            f"{ctx.obj['api_url']}/mother/actions/execute",
-            json={"action": action.lower(), "service": service, "approve": True}
+        response = _call(
+            ctx.obj['api_url'], "POST", "/mother/actions/execute",
+            json={"action": action.lower(), "service": service, "approve": True},
+            timeout=_SLOW_CALL_TIMEOUT
         )
         response.raise_for_status()
         
-        data = response.json()
+        data = _parse(response)
         
         if data.get("success"):
             click.secho("✓ Action executed successfully!", fg="green", bold=True)
@@ -200,54 +305,95 @@ def execute(ctx, action, service, approve):
         click.echo()
         click.secho("All actions are logged for audit purposes.", fg="white")
     
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
     except Exception as e:
         click.secho(f"❌ Error: {str(e)}", fg="red")
 
 
 @actions.command()
-@click.option('--limit', default=20, help='Number of audit entries to show')
+@click.option('--limit', default=20, help='Number of audit entries per page')
+@click.option('--page', default=1, help='Page to start from (1 = newest)')
 @click.pass_context
-def audit(ctx, limit):
+def audit(ctx, limit, page):
     """View action audit log."""
-    try:
-        response = requests.get(
-            f"{ctx.obj['api_url']}/mother/actions/audit",
-            params={"limit": limit}
+    api_url = ctx.obj['api_url']
+    
+    def fetch_page(number):
+        response = _call(
+            api_url, "GET", "/mother/actions/audit",
+            params={"page": number, "page_size": limit}
         )
         response.raise_for_status()
+        return _parse(response)
+    
+    def render_page(data):
+        from tabulate import tabulate
         
-        data = response.json()
-        
-        if not data["audit_log"]:
-            click.echo("📭 No action history yet.")
-            return
-        
-        click.echo()
-        click.secho(f"📋 Action Audit Log (last {limit}):", fg="cyan", bold=True)
-        click.echo()
-        
-        table_data = []
-        for log in data["audit_log"]:
-            status = "✓" if log.get("exit_code") == 0 else "✗"
-            table_data.append([
+        audit_log = data["audit_log"]
+        # tabulate iterates the rows once, so they never need to exist as a list
+        rows = (
+            (
                 log["timestamp"],
                 log["action_type"],
                 log["service"],
-                status,
+                "✓" if log.get("exit_code") == 0 else "✗",
                 log.get("error", "—")
-            ])
+            )
+            for log in audit_log
+        )
         
-        click.echo(tabulate(
-            table_data,
+        # Build the whole page first and write it in one go
+        buf = StringIO()
+        buf.write("\n")
+        buf.write(click.style(
+            f"📋 Action Audit Log (page {data['page']}/{data['total_pages']}, "
+            f"{data['total']} entries):", fg="cyan", bold=True
+        ))
+        buf.write("\n\n")
+        buf.write(tabulate(
+            rows,
             headers=["Timestamp", "Action", "Service", "Status", "Error"],
-            tablefmt="grid"
+            tablefmt="grid" if len(audit_log) < AUDIT_GRID_MAX_ROWS else "simple"
         ))
+        buf.write("\n")
+        return buf.getvalue()
+    
+    def remaining_pages(first):
+        # Later pages are only fetched as the pager asks for more output
+        yield render_page(first)
+        for number in range(first["page"] + 1, first["total_pages"] + 1):
+            yield render_page(fetch_page(number))
+    
+    try:
+        first = fetch_page(page)
+        
+        if not first["audit_log"]:
+            if first["total"]:
+                click.secho(
+                    f"⚠️  Page {first['page']} is out of range: {first['total']} entries "
+                    f"fit on {first['total_pages']} page(s) of {first['page_size']}.",
+                    fg="yellow"
+                )
+            else:
+                click.echo("📭 No action history yet.")
+            return
+        
+        if first["page"] >= first["total_pages"]:
+            click.echo(render_page(first), nl=False)
+        elif not sys.stdout.isatty():
+            # No pager when piped: print just this page instead of fetching them all
+            click.echo(render_page(first), nl=False)
+            click.echo(
+                f"page {first['page']}/{first['total_pages']} "
+                f"(next: --page {first['page'] + 1})"
+            )
+        else:
+            click.echo_via_pager(remaining_pages(first))
     
     except ImportError:
         click.secho("⚠️  tabulate not installed. Install with: pip install tabulate", fg="yellow")
-    except requests.exceptions.ConnectionError:
+    except ConnectionError:
         click.secho(f"❌ Error: Cannot connect to {ctx.obj['api_url']}", fg="red")
     except Exception as e:
         click.secho(f"❌ Error: {str(e)}", fg="red")
@@ -284,25 +430,46 @@ def _interactive_mode(ctx):
                 """, fg="white")
                 continue
             elif user_input.lower() == "status":
-                # Show service status
+                # Show service status together with recent conversations;
+                # both requests go out concurrently
                 try:
-                    response = requests.get(f"{api_url}/status")
-                    services = response.json()
+                    status_resp, history_resp = _run(_gather(
+                        api_url,
+                        ("GET", "/status", {}),
+                        ("GET", "/mother/history", {"params": {"limit": 5}}),
+                    ))
+                    services = _parse(status_resp)[:10]  # Show first 10
+                    conversations = _parse(history_resp).get("conversations", [])
+                    
+                    # Colors only on a terminal; pipes get plain text
+                    if sys.stdout.isatty():
+                        green, red, white, heading, reset = (
+                            _ANSI_GREEN, _ANSI_RED, _ANSI_WHITE, _ANSI_CYAN_BOLD, _ANSI_RESET
+                        )
+                    else:
+                        green = red = white = heading = reset = ""
+                    
+                    lines = [f"\n{heading}📊 Service Status:{reset}"]
+                    for svc in services:
+                        if svc['status'] == 0:
+                            lines.append(f"{green}   {svc['name']:20} ✓ HEALTHY{reset}")
+                        else:
+                            lines.append(f"{red}   {svc['name']:20} ✗ FAILED{reset}")
                     
-                    click.secho("\n📊 Service Status:", fg="cyan", bold=True)
-                    for svc in services[:10]:  # Show first 10
-                        status_str = "✓ HEALTHY" if svc['status'] == 0 else "✗ FAILED"
-                        color = "green" if svc['status'] == 0 else "red"
-                        click.secho(f"   {svc['name']:20} {status_str}", fg=color)
-                    click.echo()
+                    if conversations:
+                        lines.append(f"\n{heading}📋 Recent Conversations:{reset}")
+                        for conv in conversations:
+                            lines.append(f"{white}   [{conv['timestamp']}] {conv['user_query'][:50]}{reset}")
+                    lines.append("")
+                    click.echo("\n".join(lines))
                 except Exception as e:
                     click.secho(f"Error fetching status: {e}", fg="red")
                 continue
             elif user_input.lower() == "history":
                 # Show history
                 try:
-                    response = requests.get(f"{api_url}/mother/history?limit=5")
-                    data = response.json()
+                    response = _call(api_url, "GET", "/mother/history", params={"limit": 5})
+                    data = _parse(response)
                     
                     if data["conversations"]:
                         click.secho("\n📋 Recent Conversations:", fg="cyan", bold=True)
@@ -319,7 +486,7 @@ def _interactive_mode(ctx):
             elif user_input.lower() == "clear":
                 if click.confirm("Clear all conversations?"):
                     try:
-                        requests.delete(f"{api_url}/mother/clear")
+                        _call(api_url, "DELETE", "/mother/clear")
                         click.secho("✓ History cleared.\n", fg="green")
                     except Exception as e:
                         click.secho(f"Error: {e}", fg="red")
@@ -330,20 +497,19 @@ def _interactive_mode(ctx):
             
             # Chat with agent
             if user_input.strip():
-                response = requests.post(
-                    f"{api_url}/mother/chat",
-                    json={"query": user_input},
-                    timeout=30
+                response = _call(
+                    api_url, "POST", "/mother/chat",
+                    json={"query": user_input}, timeout=_SLOW_CALL_TIMEOUT
                 )
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _parse(response)
                 click.secho(f"\nMother: {data['response']}\n", fg="green")
         
         except KeyboardInterrupt:
             click.secho("\n\nGoodbye! 👋", fg="cyan")
             break
-        except requests.exceptions.ConnectionError:
+        except ConnectionError:
             click.secho(f"\n❌ Cannot connect to agent at {api_url}", fg="red")
             click.secho("Start it with: pixi run python main.py --api 5 8000\n", fg="white")
             break
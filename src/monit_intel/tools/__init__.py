@@ -1,5 +1,24 @@
-"""Tools package for Monit-Intel agent."""
+"""
+Tools package for Monit-Intel agent.
 
-from .log_reader import LogReader, log_reader, get_service_logs
+The exports are loaded from log_reader on first access. ``log_reader`` is
+always the submodule; the shared LogReader instance is
+``monit_intel.tools.log_reader.log_reader``.
+"""
 
-__all__ = ["LogReader", "log_reader", "get_service_logs"]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .log_reader import LogReader, get_service_logs, get_service_logs_batch
+
+__all__ = ["LogReader", "get_service_logs", "get_service_logs_batch"]
+
+
+def __getattr__(name: str):
+    """Import log_reader on first access to an exported name (PEP 562)."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    attr = getattr(importlib.import_module(".log_reader", __package__), name)
+    globals()[name] = attr  # Later lookups skip __getattr__
+    return attr
@@ -6,11 +6,209 @@ Supports:
 - Querying journalctl for systemd services
 """
 
+import fnmatch
+import functools
 import os
 import subprocess
 import glob
+import threading
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Final, List, Mapping, Optional, Tuple
+
+try:
+    from systemd import journal
+    _HAVE_JOURNAL = True
+except ImportError:  # systemd-python not installed; fall back to the journalctl CLI
+    _HAVE_JOURNAL = False
+
+# Size of each LogReader's fetch pool, i.e. the upper bound on concurrent
+# fetches in get_logs_for_services
+_MAX_FETCH_WORKERS = 8
+
+# get_logs_for_service results are reused for this long, so the several nodes
+# of one agent turn asking about the same failing service share a single read.
+# Kept short so fresh incident logs aren't masked
+LOG_CACHE_TTL = 5.0
+LOG_CACHE_SIZE = 64
+
+# journalctl/systemctl only need these from the environment; handing the
+# child a small dict instead of all of os.environ keeps each spawn cheap.
+# close_fds=False skips closing every inherited descriptor before exec: fds
+# Python opens are non-inheritable by default (PEP 446), so nothing leaks
+_MINIMAL_ENV = {
+    k: os.environ[k] for k in ("PATH", "LANG", "TZ", "XDG_RUNTIME_DIR") if k in os.environ
+}
+_run_tool = functools.partial(
+    subprocess.run, capture_output=True, text=True, env=_MINIMAL_ENV, close_fds=False
+)
+
+# Installed systemd service units, used to resolve unregistered services
+# without probing journalctl per candidate name; refreshed after this long
+_KNOWN_UNITS_TTL = 300.0
+_known_units_cache: Optional[Tuple[float, Optional[FrozenSet[str]]]] = None
+_known_units_lock = threading.Lock()
+
+# LoadState probes per (unit, user_service), so units systemd doesn't know
+# about skip the journal query entirely; refreshed after this long
+_UNIT_STATE_TTL = 60.0
+_unit_state_cache: Dict[Tuple[str, bool], Tuple[float, bool]] = {}
+_unit_state_lock = threading.Lock()
+
+# Tail reads walk backwards from the end of the file in blocks of this size
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Upper bound on the bytes a single tail returns; a few very long lines
+# shouldn't blow up the agent's context window
+_TAIL_MAX_BYTES = 1024 * 1024
+
+# Log Registry: where to find logs for each Monit service, kept in logs.toml
+# next to this module. Loaded once at import time and exposed read-only;
+# LogReader.reload_registry() swaps in a fresh copy.
+_REGISTRY_PATH = Path(__file__).with_name("logs.toml")
+
+# Key each strategy needs to locate its logs
+_STRATEGY_SOURCE_KEYS: Final[Mapping[str, str]] = MappingProxyType({
+    "tail_file": "path",
+    "newest_file": "pattern",
+    "journalctl": "unit",
+    "docker": "container",
+})
+
+
+def _load_registry(path: Path = _REGISTRY_PATH) -> Mapping[str, Mapping]:
+    """
+    Load and validate the log registry file.
+    
+    Args:
+        path: TOML file with one [services.<name>] table per Monit service
+        
+    Returns:
+        Read-only mapping of service name to its (read-only) config
+        
+    Raises:
+        ValueError: If an entry has an unknown strategy or lacks its source key
+    """
+    with open(path, "rb") as f:
+        services = tomllib.load(f).get("services", {})
+    
+    for name, config in services.items():
+        strategy = config.get("strategy")
+        source_key = _STRATEGY_SOURCE_KEYS.get(strategy)
+        if source_key is None:
+            raise ValueError(f"{path}: service '{name}' has unknown strategy {strategy!r}")
+        if source_key not in config:
+            raise ValueError(f"{path}: service '{name}' ({strategy}) needs '{source_key}'")
+        if not isinstance(config.get("max_lines", 1), int):
+            raise ValueError(f"{path}: service '{name}' max_lines must be an integer")
+    
+    return MappingProxyType({name: MappingProxyType(config) for name, config in services.items()})
+
+
+_LOG_REGISTRY: Mapping[str, Mapping] = _load_registry()
+
+
+def _known_units() -> Optional[FrozenSet[str]]:
+    """
+    Return the names of installed systemd service units.
+    
+    Listed once via `systemctl list-unit-files` and cached for
+    _KNOWN_UNITS_TTL seconds.
+    
+    Returns:
+        Set of unit names (e.g. 'smbd.service'), or None if systemctl is unavailable
+    """
+    global _known_units_cache
+    now = time.monotonic()
+    with _known_units_lock:
+        if _known_units_cache is not None and _known_units_cache[0] > now:
+            return _known_units_cache[1]
+        
+        try:
+            output = _run_tool(
+                ["systemctl", "list-unit-files", "--type=service", "--no-legend", "--plain"],
+                timeout=5
+            ).stdout
+            units = frozenset(line.split(None, 1)[0] for line in output.splitlines() if line.strip())
+        except Exception:
+            units = None
+        
+        # An empty listing means systemctl couldn't answer (no systemd, no bus);
+        # treat it like a missing systemctl rather than "no units exist"
+        _known_units_cache = (now + _KNOWN_UNITS_TTL, units or None)
+        return _known_units_cache[1]
+
+
+def _unit_has_logs(unit: str, user_service: bool = False) -> bool:
+    """
+    Return whether the unit can have logs, i.e. systemd knows it at all.
+    
+    Only LoadState=not-found is treated as "no logs". Units that failed to
+    load (bad-setting, error) or are masked still have journal entries, such
+    as the load error and earlier runs, and a broken unit is often the one
+    Monit is alerting on.
+    
+    Probed with `systemctl show -p LoadState` and cached for _UNIT_STATE_TTL
+    seconds. If the probe itself fails the unit is assumed to have logs, so a
+    missing systemctl never hides anything.
+    
+    Args:
+        unit: Unit name (e.g. 'smbd.service')
+        user_service: If True, ask the user manager instead of the system one
+    """
+    key = (unit, user_service)
+    now = time.monotonic()
+    with _unit_state_lock:
+        cached = _unit_state_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+    
+    cmd = ["systemctl"]
+    if user_service:
+        cmd.append("--user")
+    cmd.extend(["show", "-p", "LoadState", "--value", unit])
+    try:
+        load_state = _run_tool(cmd, timeout=1).stdout.strip()
+        has_logs = load_state != "not-found"
+    except Exception:
+        has_logs = True
+    
+    with _unit_state_lock:
+        _unit_state_cache[key] = (now + _UNIT_STATE_TTL, has_logs)
+    return has_logs
+
+
+def _journal_unit_matches(unit: str, user_service: bool = False) -> List[Dict[str, str]]:
+    """
+    Journal match groups that select a unit's entries, as `journalctl -u` does.
+    
+    Fields within a group are ANDed and the groups are ORed, so besides the
+    unit's own output this picks up systemd's messages about the unit
+    ("Main process exited", "Failed with result"), object messages logged on
+    its behalf and coredumps of its processes.
+    
+    Args:
+        unit: Unit name (e.g. 'smbd.service')
+        user_service: If True, match the user unit of the current user instead
+    """
+    if user_service:
+        uid = str(os.getuid())
+        return [
+            {"_SYSTEMD_USER_UNIT": unit, "_UID": uid},
+            {"USER_UNIT": unit, "_UID": uid},
+            {"COREDUMP_USER_UNIT": unit, "_UID": uid},
+            {"OBJECT_SYSTEMD_USER_UNIT": unit, "_UID": uid},
+        ]
+    return [
+        {"_SYSTEMD_UNIT": unit},
+        {"UNIT": unit, "_PID": "1"},
+        {"COREDUMP_UNIT": unit, "_UID": "0"},
+        {"OBJECT_SYSTEMD_UNIT": unit, "_UID": "0"},
+    ]
+
 
 class LogReader:
     """
@@ -21,13 +219,71 @@ class LogReader:
     def __init__(self, max_lines: int = 100):
         """Initialize with default max line limit (can be overridden per-service)."""
         self.max_lines = max_lines
+        # service_name -> (expires_at, result); see LOG_CACHE_TTL
+        self._log_cache: Dict[str, Tuple[float, dict]] = {}
+        self._log_cache_lock = threading.Lock()
+        # Reused by get_logs_for_services; threads start on first submit
+        self._fetch_pool = ThreadPoolExecutor(max_workers=_MAX_FETCH_WORKERS,
+                                              thread_name_prefix="log-fetch")
     
-    def tail_file(self, filepath: str) -> Optional[str]:
+    @staticmethod
+    def _tail_bytes(filepath: str, max_lines: int) -> str:
+        """
+        Return the last N lines of a file without reading all of it.
+        
+        Reads fixed-size blocks backwards from the end until enough newlines
+        have been seen, then decodes only that tail. Matches `tail -n N`,
+        except that at most _TAIL_MAX_BYTES are returned (cut at a line start).
+        
+        Args:
+            filepath: Absolute path to the file
+            max_lines: Number of trailing lines to return
+            
+        Returns:
+            Last N lines of the file
+        """
+        if max_lines <= 0:
+            return ""
+        
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            pos = os.fstat(fd).st_size
+            chunks = []
+            newlines = 0
+            # One newline more than requested guarantees the oldest kept line is complete
+            read = 0
+            while pos > 0 and newlines <= max_lines and read <= _TAIL_MAX_BYTES:
+                size = min(_TAIL_BLOCK_SIZE, pos)
+                pos -= size
+                chunk = os.pread(fd, size, pos)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+                read += size
+        finally:
+            os.close(fd)
+        
+        data = b"".join(reversed(chunks))
+        if data.endswith(b"\n"):
+            lines = data[:-1].split(b"\n")[-max_lines:]
+            tail = b"\n".join(lines) + b"\n"
+        else:
+            tail = b"\n".join(data.split(b"\n")[-max_lines:])
+        
+        if len(tail) > _TAIL_MAX_BYTES:
+            tail = tail[-_TAIL_MAX_BYTES:]
+            # Drop the partial first line, unless the cap falls inside a single line
+            cut = tail.find(b"\n", 0, len(tail) - 1)
+            if cut != -1:
+                tail = tail[cut + 1:]
+        return tail.decode("utf-8", "replace")
+    
+    def tail_file(self, filepath: str, max_lines: Optional[int] = None) -> Optional[str]:
         """
         Tail the last N lines of a flat log file.
         
         Args:
             filepath: Absolute path to the log file
+            max_lines: Number of lines to return (defaults to self.max_lines)
             
         Returns:
             Last N lines of the file, or None if file doesn't exist
@@ -36,64 +292,132 @@ class LogReader:
             return None
         
         try:
-            result = subprocess.run(
-                ["tail", "-n", str(self.max_lines), filepath],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.stdout
+            return self._tail_bytes(filepath, max_lines or self.max_lines)
         except Exception as e:
             return f"Error reading {filepath}: {e}"
     
-    def find_newest_file(self, directory_pattern: str) -> Optional[str]:
+    @staticmethod
+    def _newest_match(pattern: str) -> Optional[str]:
+        """
+        Return the most recently modified file matching a glob pattern.
+        
+        Scans the directory once with os.scandir, using the mtime cached on
+        each DirEntry, instead of glob followed by a second stat per file.
+        Patterns with wildcards in the directory part go through glob.
+        
+        Args:
+            pattern: Glob pattern whose wildcards are in the file name only
+            
+        Returns:
+            Path of the newest matching file, or None
+        """
+        dirname, basename = os.path.split(pattern)
+        if glob.has_magic(dirname):
+            files = [f for f in glob.glob(pattern, recursive=True) if os.path.isfile(f)]
+            return max(files, key=os.path.getmtime) if files else None
+        
+        # Like glob, hidden files only match patterns that start with a dot
+        include_hidden = basename.startswith(".")
+        newest = None
+        newest_mtime = None
+        try:
+            with os.scandir(dirname or ".") as it:
+                for entry in it:
+                    if entry.name.startswith(".") and not include_hidden:
+                        continue
+                    if not fnmatch.fnmatch(entry.name, basename) or not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if newest_mtime is None or mtime > newest_mtime:
+                        newest, newest_mtime = entry.path, mtime
+        except OSError:
+            return None
+        return newest
+    
+    def find_newest_file(self, directory_pattern: str, max_lines: Optional[int] = None) -> Optional[str]:
         """
         Find the newest file matching a glob pattern and return its contents.
         
         Args:
             directory_pattern: Glob pattern (e.g., '/data/tank/backups/sys_restore/backup_log_*.log')
+            max_lines: Number of lines to return (defaults to self.max_lines)
             
         Returns:
             Contents of the newest matching file, or None
         """
-        files = glob.glob(directory_pattern)
-        if not files:
+        newest = self._newest_match(directory_pattern)
+        if newest is None:
             return None
         
-        # Sort by modification time, get the newest
-        newest = max(files, key=lambda f: os.path.getmtime(f))
-        
         try:
-            with open(newest, 'r') as f:
-                lines = f.readlines()
-                # Return the last N lines
-                return "".join(lines[-self.max_lines:])
+            # Return the last N lines
+            return self._tail_bytes(newest, max_lines or self.max_lines)
         except Exception as e:
             return f"Error reading {newest}: {e}"
     
-    def query_journalctl(self, unit: str, user_service: bool = False) -> Optional[str]:
+    @staticmethod
+    def _read_journal(unit: str, user_service: bool, max_lines: int) -> str:
+        """Read the last max_lines entries for a unit through the journal bindings."""
+        # A fresh reader per query: sd_journal lists its journal files when it
+        # opens, so a long-lived reader misses files created by rotation
+        reader = journal.Reader(flags=journal.CURRENT_USER) if user_service else journal.Reader()
+        try:
+            for i, terms in enumerate(_journal_unit_matches(unit, user_service)):
+                if i:
+                    reader.add_disjunction()
+                reader.add_match(**terms)
+            reader.seek_tail()
+            entries = []
+            for _ in range(max_lines):
+                entry = reader.get_previous()
+                if not entry:
+                    break
+                entries.append(entry)
+        finally:
+            reader.close()
+        
+        if not entries:
+            return "-- No entries --\n"
+        
+        # Same shape as `journalctl --output=cat`: one MESSAGE per line
+        return "".join(f"{entry.get('MESSAGE', '')}\n" for entry in reversed(entries))
+    
+    def query_journalctl(self, unit: str, user_service: bool = False,
+                         max_lines: Optional[int] = None) -> Optional[str]:
         """
         Query systemd journal for a specific service.
         
+        Reads the journal in-process via systemd-python when it is installed,
+        otherwise shells out to journalctl. Units systemd doesn't know
+        (LoadState=not-found) are skipped without querying.
+        
         Args:
             unit: Service name (e.g., 'nordvpnd.service')
             user_service: If True, query user journal instead of system journal
+            max_lines: Number of entries to return (defaults to self.max_lines)
             
         Returns:
-            Recent journal entries for the service
+            Recent journal entries for the service, or None if the unit doesn't exist
         """
+        if not _unit_has_logs(unit, user_service):
+            return None
+        
+        max_lines = max_lines or self.max_lines
+        if _HAVE_JOURNAL:
+            try:
+                return self._read_journal(unit, user_service, max_lines)
+            except Exception:
+                pass  # Fall through to the journalctl CLI
+        
         try:
             cmd = ["journalctl"]
             if user_service:
                 cmd.append("--user")
-            cmd.extend(["-u", unit, "-n", str(self.max_lines), "--no-pager"])
+            # --output=cat prints bare MESSAGE fields: less formatting work for
+            # journalctl and no timestamp/hostname/unit prefix on every line
+            cmd.extend(["-u", unit, "-n", str(max_lines), "--no-pager", "--output=cat"])
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            result = _run_tool(cmd, timeout=5)
             if result.returncode == 0:
                 return result.stdout
             else:
@@ -106,6 +430,7 @@ class LogReader:
         Smart router: Given a Monit service name, return relevant logs.
         Uses the Log Registry from the plan.
         Each service has configurable max_lines for context depth.
+        Results are cached for LOG_CACHE_TTL seconds.
         
         Args:
             service_name: Name of the Monit service that failed
@@ -113,126 +438,81 @@ class LogReader:
         Returns:
             Dictionary with log content and metadata
         """
-        log_registry = {
-            "system_backup": {
-                "strategy": "newest_file",
-                "pattern": "/data/tank/backups/sys_restore/backup_log_*.log",
-                "max_lines": 150  # Verbose service, needs more context
-            },
-            "nordvpn_reconnect": {
-                "strategy": "tail_file",
-                "path": "/var/log/nordvpn-reconnect.log",
-                "max_lines": 75   # Medium verbosity
-            },
-            "nordvpn_connected": {
-                "strategy": "tail_file",
-                "path": "/var/log/nordvpn-reconnect.log",
-                "max_lines": 75   # Same as nordvpn_reconnect (actual Monit service name)
-            },
-            "nordvpn_status": {
-                "strategy": "journalctl",
-                "unit": "nordvpnd.service",
-                "max_lines": 50   # Terse service
-            },
-            "nordvpnd": {
-                "strategy": "journalctl",
-                "unit": "nordvpnd.service",
-                "max_lines": 50   # Same as nordvpn_status (actual Monit service name)
-            },
-            "gamma_conn": {
-                "strategy": "journalctl",
-                "unit": "tailscaled.service",
-                "max_lines": 75   # Medium verbosity
-            },
-            "tailscaled": {
-                "strategy": "journalctl",
-                "unit": "tailscaled.service",
-                "max_lines": 75   # Same as gamma_conn (actual Monit service name)
-            },
-            "network_resurrect": {
-                "strategy": "tail_file",
-                "path": "/var/log/monit-network-restart.log",
-                "max_lines": 100  # Network logs can be verbose
-            },
-            "sanoid_errors": {
-                "strategy": "journalctl",
-                "unit": "sanoid.service",
-                "max_lines": 100  # Storage operations can be detailed
-            },
-            "zfs-zed": {
-                "strategy": "journalctl",
-                "unit": "zfs-zed.service",
-                "max_lines": 100  # ZFS event daemon logs
-            },
-            "smbd": {
-                "strategy": "journalctl",
-                "unit": "smbd.service",
-                "max_lines": 75  # Samba file sharing daemon
-            },
-            "syncthing": {
-                "strategy": "journalctl",
-                "unit": "syncthing.service",
-                "user_service": True,
-                "max_lines": 75  # File synchronization service (user service)
-            },
-            # Docker-based services - logs require docker exec with sudo
-            # These are explicitly marked to skip journalctl fallback
-            "immich_server_running": {
-                "strategy": "docker",
-                "container": "immich-server",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "immich_ml_running": {
-                "strategy": "docker",
-                "container": "immich-machine-learning",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "immich_pg_running": {
-                "strategy": "docker",
-                "container": "immich-postgres",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "immich_redis_running": {
-                "strategy": "docker",
-                "container": "immich-redis",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "jellyfin_running": {
-                "strategy": "docker",
-                "container": "jellyfin",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "miniflux_running": {
-                "strategy": "docker",
-                "container": "miniflux",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            },
-            "postgres_running": {
-                "strategy": "docker",
-                "container": "postgres",
-                "max_lines": 100,
-                "note": "Docker container - logs require docker access"
-            }
-        }
+        now = time.monotonic()
+        with self._log_cache_lock:
+            cached = self._log_cache.get(service_name)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        
+        result = self._fetch_logs_for_service(service_name)
+        
+        with self._log_cache_lock:
+            if len(self._log_cache) >= LOG_CACHE_SIZE:
+                # Drop expired entries first, then the oldest if still full
+                for name in [n for n, (expires, _) in self._log_cache.items() if expires <= now]:
+                    del self._log_cache[name]
+                if len(self._log_cache) >= LOG_CACHE_SIZE:
+                    del self._log_cache[next(iter(self._log_cache))]
+            self._log_cache[service_name] = (time.monotonic() + LOG_CACHE_TTL, result)
+        return result
+    
+    def clear_cache(self) -> None:
+        """Drop all cached get_logs_for_service results."""
+        with self._log_cache_lock:
+            self._log_cache.clear()
+    
+    def reload_registry(self) -> None:
+        """
+        Re-read logs.toml so registry edits apply without a restart.
+        
+        The new registry is validated before it replaces the old one, so a
+        broken file leaves the current registry in place.
+        
+        Raises:
+            ValueError: If the file fails validation
+        """
+        global _LOG_REGISTRY
+        _LOG_REGISTRY = _load_registry()
+        self.clear_cache()
+    
+    @staticmethod
+    def log_sources() -> Dict[str, Tuple[str, str]]:
+        """
+        Describe the configured Log Registry entries.
         
+        Returns:
+            Dict mapping service name to (strategy, source), where source is the
+            path, pattern, unit or container the strategy reads
+        """
+        sources = {}
+        for name, config in _LOG_REGISTRY.items():
+            strategy = config["strategy"]
+            source = config[_STRATEGY_SOURCE_KEYS[strategy]]
+            if config.get("user_service"):
+                source = f"{source} (user)"
+            sources[name] = (strategy, source)
+        return sources
+    
+    def _fetch_logs_for_service(self, service_name: str) -> dict:
+        """Resolve a service through the Log Registry and read its logs (uncached)."""
         # Try to find service in registry, otherwise use smart fallback
-        if service_name not in log_registry:
+        if service_name not in _LOG_REGISTRY:
             # Fallback: Try journalctl with service name as unit
             # Convert Monit service names to likely systemd unit names
-            unit_names = [
-                f"{service_name}.service",      # Direct match
-                f"{service_name.replace('_', '-')}.service",  # Replace underscores
-                service_name,                    # Raw service name (for custom units)
-            ]
+            # Names that already carry the suffix (custom units) are used as-is
+            base = service_name.removesuffix(".service")
+            unit_names = tuple(dict.fromkeys((
+                f"{base}.service",                     # Direct match
+                f"{base.replace('_', '-')}.service",   # Replace underscores
+            )))
+            
+            # Only probe units systemd actually knows about; without a unit
+            # listing, fall back to trying each candidate
+            known = _known_units()
+            candidates = unit_names if known is None else [unit for unit in unit_names if unit in known][:1]
             
             # Try each unit name
-            for unit in unit_names:
+            for unit in candidates:
                 logs = self.query_journalctl(unit)
                 if logs and "Error querying" not in logs:
                     return {
@@ -248,7 +528,7 @@ class LogReader:
                 "logs": None
             }
         
-        config = log_registry[service_name]
+        config = _LOG_REGISTRY[service_name]
         strategy = config["strategy"]
         
         # Skip docker-based services (require sudo access)
@@ -260,36 +540,76 @@ class LogReader:
                 "note": config.get("note", "Docker container logs require sudo access")
             }
         
+        # Passed down explicitly (not set on self) so concurrent callers
+        # sharing one LogReader don't clobber each other
         max_lines = config.get("max_lines", self.max_lines)
         
-        # Temporarily set instance max_lines for this fetch
-        original_max = self.max_lines
-        self.max_lines = max_lines
-        
         if strategy == "tail_file":
-            logs = self.tail_file(config["path"])
+            logs = self.tail_file(config["path"], max_lines=max_lines)
         elif strategy == "newest_file":
-            logs = self.find_newest_file(config["pattern"])
+            logs = self.find_newest_file(config["pattern"], max_lines=max_lines)
         elif strategy == "journalctl":
             user_service = config.get("user_service", False)
-            logs = self.query_journalctl(config["unit"], user_service=user_service)
+            logs = self.query_journalctl(config["unit"], user_service=user_service, max_lines=max_lines)
         else:
             logs = None
         
-        # Restore original max_lines
-        self.max_lines = original_max
-        
         return {
             "service": service_name,
             "strategy": strategy,
             "logs": logs
         }
 
+    
+    def get_logs_for_services(self, service_names: List[str],
+                              timeout: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Fetch logs for several services concurrently.
+        
+        Each lookup is I/O bound (file reads or a journalctl subprocess), so
+        threads overlap them and the total time is roughly the slowest one.
+        
+        Args:
+            service_names: Monit service names
+            timeout: Seconds to wait for the whole batch (None waits for all)
+            
+        Returns:
+            Mapping of service name to the get_logs_for_service() result, in
+            request order; services still being read at the timeout are left
+            out, and a failed read becomes an error result for that service only
+        """
+        names = list(dict.fromkeys(service_names))
+        futures = {name: self._fetch_pool.submit(self.get_logs_for_service, name) for name in names}
+        done, _ = wait(futures.values(), timeout=timeout)
+        
+        results = {}
+        for name, future in futures.items():
+            if future not in done:
+                continue
+            error = future.exception()
+            results[name] = future.result() if error is None else {
+                "service": name,
+                "error": f"Error reading logs: {error}",
+            }
+        return results
+
 
 # Singleton instance for use in agent nodes
 log_reader = LogReader(max_lines=100)
 
 
+def _format_service_logs(service_name: str, result: dict) -> str:
+    """Format a get_logs_for_service() result for the LLM context."""
+    if result.get("error"):
+        return f"Error: {result['error']}"
+    
+    logs = result.get("logs")
+    if not logs:
+        return f"No logs found for {service_name}"
+    
+    return f"\n=== Logs for {service_name} ({result['strategy']}) ===\n{logs}"
+
+
 def get_service_logs(service_name: str) -> str:
     """
     Convenience function for LangGraph nodes to fetch logs.
@@ -300,13 +620,18 @@ def get_service_logs(service_name: str) -> str:
     Returns:
         Formatted log string or error message
     """
-    result = log_reader.get_logs_for_service(service_name)
-    
-    if result.get("error"):
-        return f"Error: {result['error']}"
-    
-    logs = result.get("logs")
-    if not logs:
-        return f"No logs found for {service_name}"
+    return _format_service_logs(service_name, log_reader.get_logs_for_service(service_name))
+
+
+def get_service_logs_batch(service_names: List[str]) -> Dict[str, str]:
+    """
+    Convenience function for LangGraph nodes to fetch logs for many services at once.
     
-    return f"\n=== Logs for {service_name} ({result['strategy']}) ===\n{logs}"
+    Args:
+        service_names: Monit service names
+        
+    Returns:
+        Mapping of service name to formatted log string or error message
+    """
+    results = log_reader.get_logs_for_services(service_names)
+    return {name: _format_service_logs(name, result) for name, result in results.items()}
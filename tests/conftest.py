@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """One pooled keep-alive HTTP session for the whole test run, closed at teardown."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
@@ -4,24 +4,156 @@ Integration test for username tracking feature.
 Tests the complete flow from API to database.
 """
 
+import hashlib
 import sqlite3
-import tempfile
-import os
 import json
-from typing import Optional, List, Dict
+import queue
+import uuid
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Iterator, Tuple
+
+
+# Mirrors Mother: PRAGMA user_version records that the schema is in place
+SCHEMA_VERSION = 2
+
+
+def _query_hash(user_query: str) -> bytes:
+    """16-byte BLAKE2b digest of a query, as Mother stores it in query_hash."""
+    return hashlib.blake2b(user_query.encode("utf-8"), digest_size=16).digest()
+
+
+# History queries, kept as constants so every call passes the identical SQL
+# text and hits the pooled connection's statement cache instead of re-preparing.
+# SQL_HISTORY_USER, SQL_HISTORY_ALL and SQL_FIND_BY_QUERY are the statements
+# Mother runs; the others only back MockMother's test helpers
+SQL_HISTORY_USER = """
+    SELECT id, timestamp, username, user_query, agent_response 
+    FROM conversations 
+    WHERE username = ?
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+SQL_USER_QUERIES = """
+    SELECT user_query
+    FROM conversations
+    WHERE username = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+SQL_FIND_BY_QUERY = """
+    SELECT id, timestamp, username, user_query, agent_response
+    FROM conversations
+    WHERE query_hash = ? AND user_query = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+SQL_COUNT_USER = "SELECT COUNT(*) FROM conversations WHERE username = ?"
+SQL_COUNT_ALL = "SELECT COUNT(*) FROM conversations"
+# Prefix match with GLOB rather than LIKE: GLOB is case-sensitive like the
+# default BINARY index on username, so SQLite turns 'admin*' into a range seek
+# on idx_conversations_user_ts. LIKE 'admin%' is case-insensitive and only
+# gets that treatment with PRAGMA case_sensitive_like=ON (or a NOCASE index)
+SQL_HISTORY_USER_PREFIX = """
+    SELECT id, timestamp, username, user_query, agent_response
+    FROM conversations
+    WHERE username GLOB ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+SQL_HISTORY_ALL = """
+    SELECT id, timestamp, username, user_query, agent_response 
+    FROM conversations 
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+
+
+class _ConnectionPool:
+    """Bounded pool of reusable SQLite connections to one database file."""
+    
+    # Applied once per connection when it is opened
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+    
+    def __init__(self, db_path: str, size: int = 5):
+        self.db_path = db_path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._slots = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._slots.put(None)
+    
+    def _open(self) -> sqlite3.Connection:
+        # uri=True so shared-cache in-memory URIs work; plain paths are unaffected
+        conn = sqlite3.connect(self.db_path, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection; blocks while all `size` connections are in use."""
+        self._slots.get()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()  # If this fails, the slot is still released
+            try:
+                yield conn
+            finally:
+                conn.rollback()  # Never hand on an open transaction
+                self._idle.put(conn)
+        finally:
+            self._slots.put(None)
+    
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
 # Simulate the Mother class methods we need to test
 class MockMother:
-    """Mock Mother class for testing without langgraph dependency."""
+    """
+    Mock Mother class for testing without langgraph dependency.
+    
+    The schema and the history reads mirror Mother. The connection pool,
+    query_agent_batch, count_history, user_queries and
+    get_history_by_user_prefix exist only here, to seed and inspect the
+    test database; tests/test_mother_history.py exercises the real Mother.
+    """
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._pool = _ConnectionPool(db_path)
         self._init_conversations_table()
     
+    def close(self):
+        """Release the pooled connections."""
+        self._pool.close()
+    
     def _init_conversations_table(self):
         """Create conversations table if it doesn't exist."""
-        conn = sqlite3.connect(self.db_path)
+        with self._pool.acquire() as conn:
+            self._create_schema(conn)
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Create the table, run the username migration and build indexes."""
         cursor = conn.cursor()
+        
+        # Already migrated: one PRAGMA read instead of the table probe
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -30,19 +162,45 @@ class MockMother:
                 user_query TEXT NOT NULL,
                 agent_response TEXT NOT NULL,
                 service_context TEXT,
-                logs_provided TEXT
+                logs_provided TEXT,
+                query_hash BLOB
             )
         """)
         conn.commit()
         
-        # Migration: Add username column if it doesn't exist
+        # Migration: Add username / query_hash columns if they don't exist
         cursor.execute("PRAGMA table_info(conversations)")
         columns = [col[1] for col in cursor.fetchall()]
         if "username" not in columns:
             cursor.execute("ALTER TABLE conversations ADD COLUMN username TEXT")
             conn.commit()
+        if "query_hash" not in columns:
+            cursor.execute("ALTER TABLE conversations ADD COLUMN query_hash BLOB")
+            conn.commit()
         
-        conn.close()
+        # Backfill digests for rows written before query_hash existed
+        conn.create_function("query_hash", 1, _query_hash, deterministic=True)
+        cursor.execute("""
+            UPDATE conversations SET query_hash = query_hash(user_query)
+            WHERE query_hash IS NULL
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_qhash
+            ON conversations(query_hash)
+        """)
+        
+        # Same history indexes as Mother._init_conversations_table: filtered and
+        # unfiltered reads are served newest-first from the B-tree, with no sort step
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_user_ts
+            ON conversations(username, timestamp DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_ts
+            ON conversations(timestamp DESC)
+        """)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
     
     def query_agent(self, user_query: str, username: Optional[str] = None) -> str:
         """Mock query agent that stores conversation with username."""
@@ -50,62 +208,90 @@ class MockMother:
         self._store_conversation(user_query, response, "", [], username)
         return response
     
+    def query_agent_batch(self, pairs: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """Mock query agent for several (query, username) pairs, stored in one transaction."""
+        responses = [f"Mock response to: {user_query}" for user_query, _ in pairs]
+        rows = [
+            (username, user_query, response, "[]", "", _query_hash(user_query))
+            for (user_query, username), response in zip(pairs, responses)
+        ]
+        with self._pool.acquire() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("""
+                INSERT INTO conversations (username, user_query, agent_response, service_context, logs_provided, query_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        return responses
+    
     def _store_conversation(self, user_query: str, response: str, 
                           context: str, services: List[str], username: Optional[str] = None):
         """Store conversation in SQLite."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO conversations (username, user_query, agent_response, service_context, logs_provided)
-            VALUES (?, ?, ?, ?, ?)
-        """, (username, user_query, response, json.dumps(services), context))
-        
-        conn.commit()
-        conn.close()
+        services_json = json.dumps(services, separators=(",", ":")) if services else "[]"
+        with self._pool.acquire() as conn:
+            conn.execute("""
+                INSERT INTO conversations (username, user_query, agent_response, service_context, logs_provided, query_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (username, user_query, response, services_json, context, _query_hash(user_query)))
+            conn.commit()
     
     def get_history(self, limit: int = 10, username: Optional[str] = None) -> List[Dict]:
         """Retrieve conversation history, optionally filtered by username."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if username:
-            cursor.execute("""
-                SELECT id, timestamp, username, user_query, agent_response 
-                FROM conversations 
-                WHERE username = ?
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (username, limit))
-        else:
-            cursor.execute("""
-                SELECT id, timestamp, username, user_query, agent_response 
-                FROM conversations 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-        
-        history = []
-        for row in cursor.fetchall():
-            history.append({
-                "id": row[0],
-                "timestamp": row[1],
-                "username": row[2],
-                "user_query": row[3],
-                "agent_response": row[4]
-            })
-        
-        conn.close()
-        return history
+        return list(self.iter_history(limit=limit, username=username))
+    
+    def find_by_query(self, user_query: str, limit: int = 10) -> List[Dict]:
+        """Retrieve the most recent conversations that asked exactly this query."""
+        with self._pool.acquire() as conn:
+            cursor = conn.execute(SQL_FIND_BY_QUERY, (_query_hash(user_query), user_query, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_history_by_user_prefix(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Retrieve history for all usernames starting with `prefix` (case-sensitive)."""
+        # Bracket GLOB metacharacters so they match literally
+        pattern = "".join(f"[{c}]" if c in "*?[" else c for c in prefix) + "*"
+        with self._pool.acquire() as conn:
+            cursor = conn.execute(SQL_HISTORY_USER_PREFIX, (pattern, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def count_history(self, username: Optional[str] = None) -> int:
+        """Count stored conversations, optionally for one user, without fetching rows."""
+        with self._pool.acquire() as conn:
+            if username:
+                return conn.execute(SQL_COUNT_USER, (username,)).fetchone()[0]
+            return conn.execute(SQL_COUNT_ALL).fetchone()[0]
+    
+    def user_queries(self, username: str, limit: int = 10) -> List[str]:
+        """Return a user's most recent queries, newest first."""
+        with self._pool.acquire() as conn:
+            return [row[0] for row in conn.execute(SQL_USER_QUERIES, (username, limit))]
+    
+    def iter_history(self, limit: int = 10, username: Optional[str] = None) -> Iterator[Dict]:
+        """Yield conversation history newest first, fetching rows in small batches."""
+        with self._pool.acquire() as conn:
+            cursor = conn.cursor()
+            
+            if username:
+                cursor.execute(SQL_HISTORY_USER, (username, limit))
+            else:
+                cursor.execute(SQL_HISTORY_ALL, (limit,))
+            
+            while True:
+                rows = cursor.fetchmany(64)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
 
 
 def test_complete_flow():
     """Test the complete flow of username tracking."""
     print("Testing complete username tracking flow...\n")
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False) as f:
-        temp_db = f.name
-    
+    # Shared-cache in-memory database: no disk I/O or fsync on commit. The
+    # keeper connection holds it open for the whole test
+    temp_db = f"file:testdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(temp_db, uri=True)
+    mother = None
     try:
         # Initialize Mother
         mother = MockMother(temp_db)
@@ -114,29 +300,26 @@ def test_complete_flow():
         # Simulate multiple users asking questions
         print("\nSimulating conversations from different users:")
         
-        # Alice asks questions
-        mother.query_agent("What is the system status?", username="alice")
-        print("  - alice: 'What is the system status?'")
-        
-        mother.query_agent("Check CPU usage", username="alice")
-        print("  - alice: 'Check CPU usage'")
-        
-        # Bob asks questions
-        mother.query_agent("Are there any failures?", username="bob")
-        print("  - bob: 'Are there any failures?'")
-        
-        # Charlie asks a question (no username - legacy/anonymous)
-        mother.query_agent("What about memory?", username=None)
-        print("  - anonymous: 'What about memory?'")
+        # Alice and Bob ask questions, plus one without a username
+        # (legacy/anonymous); all four are stored in a single transaction
+        conversations = [
+            ("What is the system status?", "alice"),
+            ("Check CPU usage", "alice"),
+            ("Are there any failures?", "bob"),
+            ("What about memory?", None),
+        ]
+        mother.query_agent_batch(conversations)
+        for user_query, username in conversations:
+            print(f"  - {username or 'anonymous'}: '{user_query}'")
         
         # Test 1: Get all history
         print("\nTest 1: Getting all conversation history...")
-        all_history = mother.get_history(limit=10)
-        assert len(all_history) == 4, f"Expected 4 conversations, got {len(all_history)}"
-        print(f"✓ Retrieved {len(all_history)} conversations")
+        total_count = mother.count_history()
+        assert total_count == 4, f"Expected 4 conversations, got {total_count}"
+        print(f"✓ Retrieved {total_count} conversations")
         
         # Verify usernames are stored
-        usernames_in_history = [conv.get('username') for conv in all_history]
+        usernames_in_history = [conv['username'] for conv in mother.iter_history(limit=10)]
         assert 'alice' in usernames_in_history, "Alice's username should be in history"
         assert 'bob' in usernames_in_history, "Bob's username should be in history"
         assert None in usernames_in_history, "Anonymous conversation should be in history"
@@ -144,23 +327,30 @@ def test_complete_flow():
         
         # Test 2: Get Alice's history only
         print("\nTest 2: Getting Alice's conversation history...")
+        alice_count = mother.count_history(username="alice")
+        assert alice_count == 2, f"Expected 2 conversations for Alice, got {alice_count}"
         alice_history = mother.get_history(limit=10, username="alice")
-        assert len(alice_history) == 2, f"Expected 2 conversations for Alice, got {len(alice_history)}"
         assert all(conv.get('username') == 'alice' for conv in alice_history), "All conversations should be from Alice"
-        print(f"✓ Retrieved {len(alice_history)} conversations from Alice")
+        print(f"✓ Retrieved {alice_count} conversations from Alice")
         print(f"  - Queries: {[conv['user_query'] for conv in alice_history]}")
         
         # Test 3: Get Bob's history only
         print("\nTest 3: Getting Bob's conversation history...")
+        bob_count = mother.count_history(username="bob")
+        assert bob_count == 1, f"Expected 1 conversation for Bob, got {bob_count}"
         bob_history = mother.get_history(limit=10, username="bob")
-        assert len(bob_history) == 1, f"Expected 1 conversation for Bob, got {len(bob_history)}"
         assert bob_history[0].get('username') == 'bob', "Conversation should be from Bob"
-        print(f"✓ Retrieved {len(bob_history)} conversation from Bob")
+
+        print(f"✓ Retrieved {bob_count} conversation from Bob")
         print(f"  - Query: {bob_history[0]['user_query']}")
         
+        # Re-opening an already migrated database takes the fast path
+        MockMother(temp_db).close()
+        assert mother.count_history() == 4, "Re-init should not touch existing rows"
+        
         # Test 4: Verify database structure
         print("\nTest 4: Verifying database structure...")
-        conn = sqlite3.connect(temp_db)
+        conn = sqlite3.connect(temp_db, uri=True)
         cursor = conn.cursor()
         cursor.execute("PRAGMA table_info(conversations)")
         columns = {col[1]: col[2] for col in cursor.fetchall()}
@@ -168,6 +358,8 @@ def test_complete_flow():
         assert 'username' in columns, "username column should exist"
         assert 'user_query' in columns, "user_query column should exist"
         assert 'agent_response' in columns, "agent_response column should exist"
+        cursor.execute("PRAGMA user_version")
+        assert cursor.fetchone()[0] == SCHEMA_VERSION, "Schema version should be recorded"
         print("✓ Database structure is correct")
         print(f"  - Columns: {list(columns.keys())}")
         
@@ -177,7 +369,7 @@ def test_complete_flow():
         print("\nTest 5: Testing privacy - user-specific queries...")
         
         # Alice queries for her conversations
-        alice_queries = [conv['user_query'] for conv in mother.get_history(username="alice")]
+        alice_queries = mother.user_queries("alice")
         expected_alice_queries = ["Check CPU usage", "What is the system status?"]
         
         # Verify Alice only sees her queries
@@ -189,24 +381,73 @@ def test_complete_flow():
         
         print("✓ Privacy check passed - users only see their own conversations when filtered")
         
+        # Prefix lookup matches whole-username prefixes, case-sensitively
+        assert {conv['username'] for conv in mother.get_history_by_user_prefix("al")} == {"alice"}
+        assert mother.get_history_by_user_prefix("Al") == [], "Prefix match should be case-sensitive"
+        assert mother.get_history_by_user_prefix("*") == [], "Wildcards in the prefix should match literally"
+        print("✓ Username prefix lookup works")
+        
+        # Exact-query lookup goes through the stored digest
+        matches = mother.find_by_query("Are there any failures?")
+        assert [conv['username'] for conv in matches] == ["bob"], f"Expected Bob's query, got {matches}"
+        assert mother.find_by_query("Are there any failures") == [], "Lookup should be exact"
+        print("✓ Query lookup by hash finds exact matches only")
+        
+        # Test 6: History queries use the indexes instead of scan + sort. These
+        # plans come from MockMother's copy of Mother's index DDL; the first
+        # three statements are Mother's, the rest only back the test helpers
+        print("\nTest 6: Checking history query plans...")
+        conn = sqlite3.connect(temp_db, uri=True)
+        cursor = conn.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_HISTORY_USER, ("alice", 10))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "idx_conversations_user_ts" in plan, f"Filtered history should use the index: {plan}"
+        assert "TEMP B-TREE" not in plan, f"Filtered history should not sort: {plan}"
+        
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_HISTORY_ALL, (10,))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "idx_conversations_ts" in plan, f"Unfiltered history should use the index: {plan}"
+        assert "TEMP B-TREE" not in plan, f"Unfiltered history should not sort: {plan}"
+        
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_FIND_BY_QUERY, (b"", "", 10))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "idx_conversations_qhash" in plan, f"Query lookup should use the hash index: {plan}"
+        
+        # Test-helper statements
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_USER_QUERIES, ("alice", 10))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "idx_conversations_user_ts" in plan, f"User queries should use the index: {plan}"
+        assert "TEMP B-TREE" not in plan, f"User queries should not sort: {plan}"
+        
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_HISTORY_USER_PREFIX, ("al*", 10))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "idx_conversations_user_ts (username>? AND username<?)" in plan, f"Prefix lookup should seek the index: {plan}"
+        
+        cursor.execute("EXPLAIN QUERY PLAN " + SQL_COUNT_USER, ("alice",))
+        plan = " ".join(row[3] for row in cursor.fetchall())
+        assert "COVERING INDEX idx_conversations_user_ts" in plan, f"Per-user count should be index-only: {plan}"
+        conn.close()
+        print("✓ History queries are index-backed")
+        
         print("\n" + "="*60)
         print("✓ ALL INTEGRATION TESTS PASSED!")
         print("="*60)
         
         # Print summary
         print("\nSummary:")
-        print(f"  - Total conversations: {len(all_history)}")
-        print(f"  - Alice's conversations: {len(alice_history)}")
-        print(f"  - Bob's conversations: {len(bob_history)}")
+        print(f"  - Total conversations: {total_count}")
+        print(f"  - Alice's conversations: {alice_count}")
+        print(f"  - Bob's conversations: {bob_count}")
         print(f"  - Anonymous conversations: 1")
         print("\nConclusion:")
         print("  Mother now tracks WHO asked WHAT question and WHEN.")
         print("  Users can filter their conversation history for privacy.")
         
     finally:
-        # Clean up
-        if os.path.exists(temp_db):
-            os.unlink(temp_db)
+        # Clean up (the in-memory database goes away with its last connection)
+        if mother is not None:
+            mother.close()
+        keeper.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Test LogReader's file tailing, newest-file lookup and journal matching."""
+
+import os
+import sys
+import tempfile
+import types
+
+sys.path.insert(0, 'src')
+
+import monit_intel.tools.log_reader as log_reader_module
+from monit_intel.tools.log_reader import LogReader
+
+
+def _write(path: str, data: bytes, mtime: float = None) -> str:
+    """Write a file, optionally with a fixed modification time."""
+    with open(path, "wb") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _tail_reference(data: bytes, max_lines: int) -> str:
+    """What `tail -n max_lines` prints for this file content."""
+    if max_lines <= 0:
+        return ""
+    return b"".join(data.splitlines(keepends=True)[-max_lines:]).decode("utf-8", "replace")
+
+
+def test_tail_matches_tail_n():
+    """Trailing newline or not, _tail_bytes returns what tail -n would."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            "trailing_newline": b"one\ntwo\nthree\n",
+            "no_final_newline": b"one\ntwo\nthree",
+            "blank_lines": b"one\n\n\ntwo\n\n",
+            "single_line": b"only line",
+            "empty": b"",
+        }
+        for name, data in cases.items():
+            path = _write(os.path.join(tmp, name), data)
+            for max_lines in (1, 2, 3, 10):
+                got = LogReader._tail_bytes(path, max_lines)
+                assert got == _tail_reference(data, max_lines), \
+                    f"{name}, {max_lines} lines: got {got!r}"
+    print("✓ Tail output matches tail -n")
+
+
+def test_tail_zero_lines():
+    """Asking for no lines returns nothing without reading the file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(os.path.join(tmp, "app.log"), b"one\ntwo\n")
+        assert LogReader._tail_bytes(path, 0) == ""
+        assert LogReader._tail_bytes(path, -5) == ""
+    print("✓ Zero lines returns an empty string")
+
+
+def test_tail_lines_across_blocks():
+    """Lines that straddle block boundaries come back whole."""
+    original_block = log_reader_module._TAIL_BLOCK_SIZE
+    log_reader_module._TAIL_BLOCK_SIZE = 7  # Smaller than most lines below
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            lines = [f"line {i} {'x' * (i % 13)}\n".encode() for i in range(50)]
+            for ending in (b"", b"last line without newline"):
+                data = b"".join(lines) + ending
+                path = _write(os.path.join(tmp, "blocks.log"), data)
+                for max_lines in (1, 2, 5, 17, 49, 50, 51, 100):
+                    got = LogReader._tail_bytes(path, max_lines)
+                    assert got == _tail_reference(data, max_lines), \
+                        f"{max_lines} lines with ending {ending!r}: got {got!r}"
+    finally:
+        log_reader_module._TAIL_BLOCK_SIZE = original_block
+    print("✓ Lines crossing block boundaries are intact")
+
+
+def test_tail_byte_cap():
+    """Output is capped at _TAIL_MAX_BYTES and starts at a line boundary."""
+    cap = log_reader_module._TAIL_MAX_BYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        # Twice the cap in 100-byte lines
+        line_count = 2 * cap // 100
+        data = b"".join(f"{i:09d} {'y' * 89}\n".encode() for i in range(line_count))
+        path = _write(os.path.join(tmp, "big.log"), data)
+
+        got = LogReader._tail_bytes(path, line_count)
+        assert len(got.encode()) <= cap, f"Tail is {len(got.encode())} bytes, cap is {cap}"
+        assert got.endswith(f"{line_count - 1:09d} {'y' * 89}\n"), "Tail should end with the last line"
+        assert all(len(line) == 99 for line in got.splitlines()), "Every line should be complete"
+        assert len(got.splitlines()) == cap // 100, "Tail should keep as many whole lines as fit"
+
+        # A line longer than the cap is cut to its last _TAIL_MAX_BYTES bytes
+        huge = _write(os.path.join(tmp, "huge.log"), b"z" * (cap + 10) + b"\n")
+        assert len(LogReader._tail_bytes(huge, 1)) == cap
+    print("✓ Tail output respects the byte cap")
+
+
+def test_newest_match():
+    """The newest regular, non-hidden file matching the pattern wins."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(os.path.join(tmp, "backup_log_1.log"), b"old\n", mtime=1000)
+        newest = _write(os.path.join(tmp, "backup_log_2.log"), b"new\n", mtime=2000)
+        _write(os.path.join(tmp, "other.txt"), b"newer but not a match\n", mtime=3000)
+        # Hidden files and directories that match the pattern are newer still
+        hidden = _write(os.path.join(tmp, ".backup_log_3.log"), b"hidden\n", mtime=4000)
+        os.mkdir(os.path.join(tmp, "backup_log_dir.log"))
+        os.utime(os.path.join(tmp, "backup_log_dir.log"), (5000, 5000))
+
+        assert LogReader._newest_match(os.path.join(tmp, "backup_log_*.log")) == newest
+        assert LogReader._newest_match(os.path.join(tmp, "*.log")) == newest
+        # Like glob, a pattern that starts with a dot does match hidden files
+        assert LogReader._newest_match(os.path.join(tmp, ".backup_log_*.log")) == hidden
+        assert LogReader._newest_match(os.path.join(tmp, "missing_*.log")) is None
+        assert LogReader._newest_match(os.path.join(tmp, "no_such_dir", "*.log")) is None
+
+        # Wildcards in the directory part go through glob
+        sub = os.path.join(tmp, "sub")
+        os.mkdir(sub)
+        nested = _write(os.path.join(sub, "backup_log_9.log"), b"nested\n", mtime=6000)
+        assert LogReader._newest_match(os.path.join(tmp, "s*", "*.log")) == nested
+
+        reader = LogReader(max_lines=10)
+        assert reader.find_newest_file(os.path.join(tmp, "backup_log_*.log")) == "new\n"
+    print("✓ Newest file lookup skips hidden files and directories")
+
+
+class _FakeJournalReader:
+    """In-memory sd_journal: add_match fields are ANDed, add_disjunction ORs groups."""
+
+    entries = []
+
+    def __init__(self, flags=0):
+        self._groups = [{}]
+        self._position = 0
+        self._matched = []
+
+    def add_match(self, **terms):
+        self._groups[-1].update(terms)
+
+    def add_disjunction(self):
+        self._groups.append({})
+
+    def seek_tail(self):
+        self._matched = [
+            entry for entry in self.entries
+            if any(all(entry.get(k) == v for k, v in group.items()) for group in self._groups if group)
+        ]
+        self._position = len(self._matched)
+
+    def get_previous(self):
+        self._position -= 1
+        return self._matched[self._position] if self._position >= 0 else {}
+
+    def close(self):
+        pass
+
+
+def test_journal_matches_like_journalctl_u():
+    """The in-process journal path returns systemd's own messages about the unit too."""
+    _FakeJournalReader.entries = [
+        {"_SYSTEMD_UNIT": "smbd.service", "_PID": "812", "MESSAGE": "smbd started"},
+        {"_SYSTEMD_UNIT": "nmbd.service", "_PID": "813", "MESSAGE": "other unit"},
+        {"_SYSTEMD_UNIT": "init.scope", "UNIT": "smbd.service", "_PID": "1",
+         "MESSAGE": "smbd.service: Main process exited, code=exited, status=1/FAILURE"},
+        {"_SYSTEMD_UNIT": "init.scope", "UNIT": "smbd.service", "_PID": "1",
+         "MESSAGE": "smbd.service: Failed with result 'exit-code'."},
+        {"UNIT": "smbd.service", "_PID": "4242", "MESSAGE": "UNIT= spoofed by another process"},
+        {"_SYSTEMD_UNIT": "systemd-coredump@0.service", "COREDUMP_UNIT": "smbd.service", "_UID": "0",
+         "MESSAGE": "Process 812 (smbd) dumped core."},
+    ]
+    missing = object()
+    original_journal = getattr(log_reader_module, "journal", missing)
+    log_reader_module.journal = types.SimpleNamespace(Reader=_FakeJournalReader, CURRENT_USER=1)
+    try:
+        output = LogReader._read_journal("smbd.service", False, 10)
+    finally:
+        if original_journal is missing:
+            del log_reader_module.journal
+        else:
+            log_reader_module.journal = original_journal
+
+    assert output.splitlines() == [
+        "smbd started",
+        "smbd.service: Main process exited, code=exited, status=1/FAILURE",
+        "smbd.service: Failed with result 'exit-code'.",
+        "Process 812 (smbd) dumped core.",
+    ], f"Unexpected journal lines: {output!r}"
+    print("✓ Journal reads match journalctl -u")
+
+
+def test_unit_has_logs_skips_only_missing_units():
+    """Units that failed to load or are masked still get their journal read."""
+    original_run = log_reader_module._run_tool
+    try:
+        for load_state, expected in (("loaded", True), ("bad-setting", True), ("error", True),
+                                     ("masked", True), ("not-found", False), ("", True)):
+            log_reader_module._run_tool = \
+                lambda cmd, timeout, state=load_state: types.SimpleNamespace(stdout=f"{state}\n")
+            log_reader_module._unit_state_cache.clear()
+            assert log_reader_module._unit_has_logs("smbd.service") is expected, \
+                f"LoadState={load_state!r} should give {expected}"
+    finally:
+        log_reader_module._run_tool = original_run
+        log_reader_module._unit_state_cache.clear()
+    print("✓ Only not-found units are skipped")
+
+
+if __name__ == "__main__":
+    print("Running log reader tests...\n")
+    test_tail_matches_tail_n()
+    test_tail_zero_lines()
+    test_tail_lines_across_blocks()
+    test_tail_byte_cap()
+    test_newest_match()
+    test_journal_matches_like_journalctl_u()
+    test_unit_has_logs_skips_only_missing_units()
+    print("\n✓ All tests PASSED!")
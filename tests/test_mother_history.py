@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Test Mother's conversation history reads against a real database (LLM stubbed)."""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+sys.path.insert(0, 'src')
+
+from monit_intel.agent import mother as mother_module
+from monit_intel.agent.mother import Mother
+from test_integration_username import MockMother
+
+
+class _StubLLM:
+    """Stands in for ChatOllama so query_agent runs without an Ollama server."""
+
+    def invoke(self, messages):
+        class Reply:
+            content = "Hello from the stub"
+        return Reply()
+
+
+def _make_db(directory: str) -> str:
+    """Create a history database with the snapshots table ingest.py would create."""
+    db_path = os.path.join(directory, "monit_history.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            service_name TEXT,
+            status INTEGER,
+            raw_json TEXT
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_history_cache_invalidated_on_write():
+    """A cached history read is served until this Mother stores a new turn."""
+    original_llm = mother_module._get_llm
+    mother_module._get_llm = lambda: _StubLLM()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            mother = Mother(db_path=_make_db(tmp))
+
+            mother.query_agent("hello there", username="alice")
+            first = mother.get_history(username="alice", cache=True)
+            assert len(first) == 1, f"Expected 1 conversation, got {len(first)}"
+
+            hits = mother._history_cached.cache_info().hits
+            assert mother.get_history(username="alice", cache=True) == first
+            assert mother._history_cached.cache_info().hits == hits + 1, "Repeat read should be cached"
+
+            # The buffered write bumps the generation before it reaches the table
+            mother.query_agent("hi again", username="alice")
+            assert len(mother.get_history(username="alice", cache=True)) == 2, \
+                "A stored turn should invalidate the cached history"
+
+            mother.flush_conversations()
+        print("✓ History cache invalidation test PASSED")
+    finally:
+        mother_module._get_llm = original_llm
+
+
+def test_history_sees_other_writers():
+    """Uncached reads (the default) see turns stored by another Mother on the same DB."""
+    original_llm = mother_module._get_llm
+    mother_module._get_llm = lambda: _StubLLM()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = _make_db(tmp)
+            reader = Mother(db_path=db_path)
+            writer = Mother(db_path=db_path)
+
+            writer.query_agent("hello there", username="bob")
+            writer.flush_conversations()
+            assert len(reader.get_history(username="bob")) == 1
+
+            writer.query_agent("hi again", username="bob")
+            writer.flush_conversations()
+            history = reader.get_history(username="bob")
+            assert len(history) == 2, f"Expected 2 conversations, got {len(history)}"
+            assert history[0]["agent_response"] == "Hello from the stub"
+        print("✓ Multi-writer history test PASSED")
+    finally:
+        mother_module._get_llm = original_llm
+
+
+def _conversation_indexes(db_path: str) -> dict:
+    """Map each conversations index name to its whitespace-normalized DDL."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'conversations' AND sql IS NOT NULL
+    """).fetchall()
+    conn.close()
+    return {name: " ".join(sql.split()) for name, sql in rows}
+
+
+def test_mock_indexes_match_mother():
+    """MockMother's query-plan checks only mean something if its indexes are Mother's."""
+    with tempfile.TemporaryDirectory() as tmp:
+        mother_db = _make_db(tmp)
+        Mother(db_path=mother_db)
+        mock_db = os.path.join(tmp, "mock.db")
+        MockMother(mock_db).close()
+
+        expected = _conversation_indexes(mother_db)
+        assert expected, "Mother should create conversation indexes"
+        assert _conversation_indexes(mock_db) == expected, \
+            "MockMother's conversation indexes differ from Mother's"
+    print("✓ MockMother index parity test PASSED")
+
+
+def _make_old_schema_db(directory: str) -> str:
+    """Create a database as an early Mother left it: no username, query_hash or conversation_services."""
+    db_path = _make_db(directory)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            user_query TEXT NOT NULL,
+            agent_response TEXT NOT NULL,
+            service_context TEXT,
+            logs_provided TEXT
+        )
+    """)
+    conn.executemany("""
+        INSERT INTO conversations (timestamp, user_query, agent_response, service_context)
+        VALUES (?, ?, ?, ?)
+    """, [
+        ("2025-01-01 10:00:00", "is nginx up?", "Yes", '["nginx"]'),
+        ("2025-01-01 11:00:00", "check nginx and docker", "Both fine", '["nginx","docker"]'),
+        ("2025-01-01 12:00:00", "hello", "Hi", "[]"),
+        ("2025-01-01 13:00:00", "legacy row", "Old", "not json"),
+    ])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_old_schema_migrated_in_place():
+    """Opening an old database adds the new columns and backfills service rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _make_old_schema_db(tmp)
+        mother = Mother(db_path=db_path)
+
+        conn = sqlite3.connect(db_path)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(conversations)")}
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        pairs = conn.execute("""
+            SELECT c.user_query, cs.service_name
+            FROM conversation_services cs JOIN conversations c ON c.id = cs.conversation_id
+            ORDER BY c.id, cs.service_name
+        """).fetchall()
+        conn.close()
+
+        assert {"username", "query_hash"} <= columns, f"Missing migrated columns: {columns}"
+        assert version == mother_module.CONVERSATIONS_SCHEMA_VERSION
+        assert pairs == [
+            ("is nginx up?", "nginx"),
+            ("check nginx and docker", "docker"),
+            ("check nginx and docker", "nginx"),
+        ], f"Unexpected backfill: {pairs}"
+
+        # Existing rows are readable through the new lookups
+        nginx = mother.get_history_for_service("nginx")
+        assert [c["user_query"] for c in nginx] == ["check nginx and docker", "is nginx up?"]
+        assert [c["user_query"] for c in mother.get_history(limit=10)][0] == "legacy row"
+
+        # A second open is a no-op, not a second backfill
+        Mother(db_path=db_path)
+        assert len(mother.get_history_for_service("nginx")) == 2
+    print("✓ Old-schema migration test PASSED")
+
+
+def test_service_rows_follow_conversations():
+    """The insert trigger indexes new turns by service and clear_history removes them."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _make_db(tmp)
+        mother = Mother(db_path=db_path)
+
+        mother._store_conversation("how is nginx?", "Fine", "", ["nginx"], username="alice")
+        mother._store_conversation("nginx vs docker", "Both up", "", ["nginx", "docker"], username="bob")
+        mother._store_conversation("hello", "Hi", "", [], username="alice")
+
+        nginx = mother.get_history_for_service("nginx")
+        # Both turns can share a timestamp, so compare without relying on order
+        assert sorted(c["user_query"] for c in nginx) == ["how is nginx?", "nginx vs docker"], \
+            f"Unexpected nginx history: {nginx}"
+        assert [c["user_query"] for c in mother.get_history_for_service("docker")] == ["nginx vs docker"]
+        assert mother.get_history_for_service("postfix") == []
+        assert len(mother.get_history_for_service("nginx", limit=1)) == 1
+
+        mother.clear_history()
+        conn = sqlite3.connect(db_path)
+        remaining = conn.execute("SELECT COUNT(*) FROM conversation_services").fetchone()[0]
+        conn.close()
+        assert remaining == 0, f"clear_history left {remaining} service rows"
+        assert mother.get_history_for_service("nginx") == []
+    print("✓ Conversation service index test PASSED")
+
+
+def test_find_by_query_uses_stored_hashes():
+    """Exact-query lookups hit for stored and backfilled rows alike."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = _make_old_schema_db(tmp)
+        mother = Mother(db_path=db_path)
+
+        # The migration's SQL backfill must produce the digests _query_hash computes
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT user_query, query_hash FROM conversations").fetchall()
+        conn.close()
+        assert rows and all(h == mother_module._query_hash(q) for q, h in rows), \
+            "Backfilled query hashes differ from _query_hash"
+        assert [c["agent_response"] for c in mother.find_by_query("is nginx up?")] == ["Yes"]
+
+        mother._store_conversation("is nginx up?", "Still yes", "", ["nginx"], username="alice")
+        mother._store_conversation("is nginx up", "Near miss", "", ["nginx"], username="alice")
+        found = mother.find_by_query("is nginx up?")
+        assert sorted(c["agent_response"] for c in found) == ["Still yes", "Yes"], \
+            f"Unexpected matches: {found}"
+        assert mother.find_by_query("is NGINX up?") == [], "Lookups are exact, not case-folded"
+        assert len(mother.find_by_query("is nginx up?", limit=1)) == 1
+    print("✓ Query hash lookup test PASSED")
+
+
+if __name__ == "__main__":
+    print("Running Mother history tests...\n")
+    test_history_cache_invalidated_on_write()
+    test_history_sees_other_writers()
+    test_mock_indexes_match_mother()
+    test_old_schema_migrated_in_place()
+    test_service_rows_follow_conversations()
+    test_find_by_query_uses_stored_hashes()
+    print("\n✓ All tests PASSED!")